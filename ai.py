@@ -0,0 +1,334 @@
+"""
+Jogador artificial por busca em árvore Monte Carlo (MCTS).
+
+A cada jogada, o bot simula continuações a partir de cópias do estado
+(GameState.copy) até esgotar o tempo da jogada. As cartas de inundação
+são desconhecidas para os jogadores; por isso cada iteração sorteia uma
+ordem para a pilha de compra e joga todas as ações da raiz com a mesma
+ordem, de modo que as ações são comparadas sob o mesmo acaso. Cada
+simulação segue com a política gulosa até o fim da partida e vale 1 na
+vitória e 0 na derrota. O bot só troca a jogada gulosa por outra ação
+quando ela venceu mais simulações, então nunca joga pior que a gulosa
+por ruído da busca.
+
+Abaixo da raiz, a jogada do próximo jogador é escolhida por UCB1 com
+alargamento progressivo: cada nó começa só com a jogada gulosa e ganha
+outra ação candidata conforme acumula visitas, de modo que as poucas
+simulações de uma jogada não se espalham por ações ruins. Essas
+estatísticas ficam em uma tabela de transposição indexada pelo hash do
+estado (GameState.state_key), e caminhos diferentes que levam ao mesmo
+tabuleiro se somam.
+
+Com mais de um processo, cada um roda uma busca independente sobre o
+mesmo estado e as visitas de cada ação são somadas no final.
+
+Uso no simulador: python simulator.py --policy ai:mcts_policy --games 100
+"""
+import math
+import multiprocessing
+import random
+import time
+
+from constants import ESCAPE_TERRAIN, TREASURE_NAMES, TREASURE_TERRAINS
+from flood import MAX_WATER_LEVEL
+from movement import MovementService
+from simulator import greedy_policy
+
+# Tempo padrão por jogada, em segundos
+DEFAULT_TIME_BUDGET = 0.2
+
+# Parte do tempo reservada para distribuir a busca e combinar os resultados
+POOL_OVERHEAD = 0.03
+
+# Fração do tempo reservada em toda busca para a escolha final e para
+# simulações um pouco mais longas que as já medidas
+SEARCH_MARGIN = 0.05
+
+# Constante de exploração do UCB1 abaixo da raiz
+EXPLORATION = 0.3
+
+# Alargamento progressivo: um nó com n visitas considera 1 + WIDENING * sqrt(n) ações
+WIDENING = 1.0
+
+# Profundidade da árvore: a raiz e a jogada seguinte. Com 20 ms por
+# jogada no 6x6, árvores mais fundas dividem as simulações entre nós
+# demais e venceram menos que a gulosa
+MAX_TREE_DEPTH = 2
+
+# Turnos simulados depois da árvore; partidas 6x6 com a política gulosa
+# terminam em até ~22 turnos. Em tabuleiros maiores a simulação pode
+# parar antes do fim e o estado é avaliado por evaluate()
+ROLLOUT_TURNS = 30
+
+
+def evaluate(state, movement):
+    """
+    Valor de um estado entre 0 (derrota) e 1 (vitória). Partidas ainda em
+    andamento valem pelos tesouros capturados, pela distância dos
+    jogadores ao próximo objetivo e pelo nível da água.
+
+    :param state: Estado avaliado.
+    :param movement: Serviço de alcance da partida; as distâncias são
+        caminhos pelos tiles não afundados, guardados em cache por tabuleiro.
+    :type movement: MovementService
+    """
+    if state.is_won():
+        return 1.0
+    if state.is_lost():
+        return 0.0
+    goals = frozenset(terrain for treasure, terrains in TREASURE_TERRAINS.items()
+                      if treasure not in state.captured_treasures
+                      for terrain in terrains if state.is_walkable(terrain))
+    if not goals:
+        goals = frozenset((ESCAPE_TERRAIN,))
+    movement.observe(state)
+    distances = movement.distances_to(goals)
+    # Distância média dos jogadores ao objetivo mais próximo, de 0 (longe ou sem caminho) a 1 (no objetivo)
+    horizon = 2 * state.grid_size
+    closeness = 0.0
+    for position in state.player_positions.values():
+        distance = distances.get(position)
+        if distance is not None:
+            closeness += max(0.0, 1 - distance / horizon)
+    closeness /= len(state.player_positions)
+    return (0.1
+            + 0.6 * len(state.captured_treasures) / len(TREASURE_NAMES)
+            + 0.2 * closeness
+            + 0.1 * (1 - state.water_level / MAX_WATER_LEVEL))
+
+def rollout(state, movement, turns=ROLLOUT_TURNS):
+    """ Joga até `turns` turnos com a política gulosa e avalia o resultado; o acaso vem das cartas de inundação. """
+    for _ in range(turns):
+        if state.is_over():
+            break
+        direction = greedy_policy(state)
+        if direction is None or state.move_player(direction) is None:
+            state.pass_turn()
+    return evaluate(state, movement)
+
+
+class TranspositionTable:
+    """
+    Estatísticas da busca indexadas pelo hash do estado.
+
+    :param exploration: Constante de exploração do UCB1.
+    :param widening: Constante do alargamento progressivo.
+    """
+    def __init__(self, exploration=EXPLORATION, widening=WIDENING):
+        self.exploration = exploration
+        self.widening = widening
+        self.visits = {}  # Hash do estado -> visitas
+        self.edges = {}  # (hash do estado, ação) -> [visitas, soma dos valores]
+
+    def select(self, key, actions, preferred):
+        """
+        Escolhe a ação a explorar entre as candidatas do nó: `preferred` e,
+        conforme as visitas, as demais na ordem de `actions`. Candidatas
+        nunca tentadas vêm primeiro, depois a de maior UCB1.
+
+        :param preferred: Ação tentada primeiro, em geral a gulosa.
+        :return: Tupla (ação, True se a ação foi tentada agora pela primeira vez).
+        :rtype: tuple
+        """
+        visits_here = self.visits.get(key, 0)
+        width = 1 + int(self.widening * math.sqrt(visits_here))
+        candidates = [preferred] + [action for action in actions if action != preferred][:width - 1]
+        for action in candidates:
+            if (key, action) not in self.edges:
+                return action, True
+        log_visits = math.log(visits_here)
+        best_action, best_score = None, -1.0
+        for action in candidates:
+            visits, total = self.edges[(key, action)]
+            score = total / visits + self.exploration * math.sqrt(log_visits / visits)
+            if score > best_score:
+                best_action, best_score = action, score
+        return best_action, False
+
+    def backpropagate(self, path, value):
+        for key, action in path:
+            self.visits[key] = self.visits.get(key, 0) + 1
+            edge = self.edges.get((key, action))
+            if edge is None:
+                self.edges[(key, action)] = [1, value]
+            else:
+                edge[0] += 1
+                edge[1] += value
+
+    def root_stats(self, key, actions):
+        """ Visitas e soma dos valores de cada ação da raiz. """
+        return {action: tuple(self.edges.get((key, action), (0, 0.0))) for action in actions}
+
+
+def search(state, time_budget, seed=None, exploration=EXPLORATION, max_iterations=None):
+    """
+    Busca MCTS a partir de `state`, sem alterá-lo. Cada iteração simula
+    todas as ações da raiz com a mesma ordem de cartas de inundação.
+
+    Antes de cada simulação a busca confere se a mais longa até agora
+    ainda cabe no tempo; se não couber, para e descarta a iteração
+    incompleta, que compararia as ações com cartas diferentes. Em
+    tabuleiros em que nenhuma iteração cabe no tempo, as estatísticas
+    ficam vazias e o bot joga a ação gulosa.
+
+    :param state: Estado atual.
+    :type state: GameState
+    :param time_budget: Tempo da busca, em segundos, incluindo a margem SEARCH_MARGIN.
+    :param seed: Semente das simulações.
+    :param exploration: Constante de exploração do UCB1.
+    :param max_iterations: Limite de iterações; com um limite e tempo de sobra, a busca é reproduzível.
+    :return: Tupla ({ação: (visitas, soma dos valores)}, iterações).
+    :rtype: tuple
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget * (1 - SEARCH_MARGIN)
+    rng = random.Random(seed)
+    table = TranspositionTable(exploration)
+    movement = MovementService(state)
+    root_key = state.state_key()
+    root_actions = state.legal_actions()
+    iterations = 0
+    # Duração da simulação mais longa até agora. Antes da primeira, o dobro
+    # do preparo: como MovementService, evaluate() percorre o tabuleiro todo
+    slowest = 2 * (time.perf_counter() - started)
+    while iterations != max_iterations:
+        deal = rng.getrandbits(64)
+        results = []  # (caminho, valor) de cada ação da raiz nesta iteração
+        for root_action in root_actions:
+            started = time.perf_counter()
+            if started + slowest > deadline:
+                break
+            simulation = state.copy(random.Random(deal))
+            simulation.rng.shuffle(simulation.flood_deck.draw_pile)  # Os jogadores não conhecem a ordem das cartas
+            simulation.apply_action(root_action)
+            path = [(root_key, root_action)]
+            for _ in range(MAX_TREE_DEPTH - 1):
+                actions = simulation.legal_actions()
+                if not actions:
+                    break
+                key = simulation.state_key()
+                action, expanded = table.select(key, actions, default_action(simulation))
+                path.append((key, action))
+                simulation.apply_action(action)
+                if expanded:
+                    break
+            results.append((path, rollout(simulation, movement)))
+            slowest = max(slowest, time.perf_counter() - started)
+        if len(results) < len(root_actions):
+            break
+        for path, value in results:
+            table.backpropagate(path, value)
+        iterations += 1
+    return table.root_stats(root_key, root_actions), iterations
+
+def search_task(task):
+    """ Busca executada nos processos do pool; recebe apenas dados serializáveis. """
+    state, time_budget, seed, exploration = task
+    return search(state, time_budget, seed, exploration)
+
+def warm_up(_):
+    """ Tarefa vazia que obriga os processos do pool a iniciar e importar este módulo. """
+    return None
+
+def default_action(state):
+    """ Jogada da política gulosa, que o bot só troca por uma ação que venceu mais simulações. """
+    return greedy_policy(state) or "passar"
+
+def best_action(stats, default):
+    """
+    Ação de maior valor médio. Todas as ações têm as mesmas visitas, então
+    a média compara as vitórias sob as mesmas cartas; sem visitas, fica a
+    ação padrão.
+
+    :param stats: {ação: (visitas, soma dos valores)}.
+    :param default: Ação mantida a menos que outra tenha média estritamente maior.
+    """
+    def mean(action):
+        visits, total = stats[action]
+        return total / visits if visits else 0.0
+    best = max(stats, key=mean)
+    return best if mean(best) > mean(default) else default
+
+def choose_action(state, time_budget=DEFAULT_TIME_BUDGET, seed=None, max_iterations=None):
+    """
+    Escolhe a ação do jogador da vez com uma busca em um único processo.
+
+    :return: Direção, "passar" ou None se a partida terminou.
+    """
+    actions = state.legal_actions()
+    if len(actions) <= 1:
+        return actions[0] if actions else None
+    stats, _ = search(state, time_budget, seed, max_iterations=max_iterations)
+    return best_action(stats, default_action(state))
+
+
+class MCTSPlayer:
+    """
+    Bot que pode ocupar qualquer papel de player_turn_order.
+
+    :param time_budget: Tempo máximo por jogada, em segundos.
+    :param workers: Processos usados na busca; com 1, busca no processo atual.
+        Com mais, o pool é criado e aquecido aqui, para a primeira jogada
+        não pagar o início dos processos.
+    :param seed: Semente das buscas, para jogadas reproduzíveis.
+    :param exploration: Constante de exploração do UCB1.
+    """
+    def __init__(self, time_budget=DEFAULT_TIME_BUDGET, workers=1, seed=None, exploration=EXPLORATION):
+        self.time_budget = time_budget
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.exploration = exploration
+        self.pool = None
+        self.last_iterations = 0
+        if workers > 1:
+            self.pool = multiprocessing.Pool(workers)
+            self.pool.map(warm_up, range(workers))
+
+    def choose(self, state):
+        """
+        Escolhe a ação do jogador da vez.
+
+        :param state: Estado atual; não é alterado.
+        :type state: GameState
+        :return: Direção, "passar" ou None se a partida terminou.
+        """
+        actions = state.legal_actions()
+        if len(actions) <= 1:
+            return actions[0] if actions else None
+        if self.workers == 1:
+            stats, self.last_iterations = search(state, self.time_budget, self.rng.getrandbits(64), self.exploration)
+            return best_action(stats, default_action(state))
+
+        budget = max(0.001, self.time_budget - POOL_OVERHEAD)
+        tasks = [(state, budget, self.rng.getrandbits(64), self.exploration) for _ in range(self.workers)]
+        stats = {action: [0, 0.0] for action in actions}
+        self.last_iterations = 0
+        for worker_stats, iterations in self.pool.map(search_task, tasks):
+            self.last_iterations += iterations
+            for action, (visits, total) in worker_stats.items():
+                stats[action][0] += visits
+                stats[action][1] += total
+        return best_action(stats, default_action(state))
+
+    def __call__(self, state):
+        """ Interface de política do simulador: direção, ou None para passar a vez. """
+        action = self.choose(state)
+        return None if action == "passar" else action
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+# Bot usado por `--policy ai:mcts_policy`; o simulador já distribui as partidas entre processos
+MCTS_POLICY_BUDGET = 0.02
+
+_policy_player = None
+
+def mcts_policy(state):
+    """ Política para o simulador, com um bot de um processo e pouco tempo por jogada. """
+    global _policy_player
+    if _policy_player is None:
+        _policy_player = MCTSPlayer(MCTS_POLICY_BUDGET)
+    return _policy_player(state)
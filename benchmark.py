@@ -0,0 +1,402 @@
+"""
+Benchmarks dos caminhos quentes do jogo 'Ilha Proibida'.
+
+Mede a preparação do tabuleiro, draw_grid, a latência de um movimento
+via move_player, um frame após uma rajada de entrada, o custo de
+redesenhar um tile, o zoom, o tempo de importação dos módulos e a vazão
+de partidas sem interface gráfica,
+no grid clássico e em um grid grande (LARGE_GRID). Por padrão o canvas é
+substituído por um stub em Python, o que mede o nosso código sem o custo
+do Tk; com --tk usa o tkinter de verdade (em máquinas sem monitor, rode
+com xvfb-run).
+
+Uso:
+    python benchmark.py --save-baseline     # grava a referência local
+    python benchmark.py --check             # falha se algo ficou mais lento
+    xvfb-run python benchmark.py --tk --check
+"""
+import argparse
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import types
+
+from engine import GameState
+from simulator import greedy_policy, play_game
+
+RESULTS_PATH = "benchmark_results.json"
+BASELINE_PATH = "benchmark_baseline.json"
+
+# Folga aceita em relação à referência antes de acusar regressão
+DEFAULT_TOLERANCE = 0.25
+
+# Folga absoluta mínima, para que medidas de poucos microssegundos não oscilem
+MIN_SLACK_US = 2.0
+
+# Grid usado nas medidas de tabuleiro grande
+LARGE_GRID = 20
+
+# Tempo máximo de importação de cada módulo em um interpretador novo, em milissegundos.
+# Os processos do simulador e os bots importam engine/simulator; nenhum deles pode abrir o Tk.
+IMPORT_BUDGET_MS = {
+    "constants": 5,
+    "engine": 50,
+    "simulator": 60,
+    "run": 60
+}
+
+IMPORT_PROBE = ("import sys, time; start = time.perf_counter(); import {module}; "
+                "print((time.perf_counter() - start) * 1e6, 'tkinter' in sys.modules)")
+
+
+class StubWidget:
+    """ Widget sem efeito, com a parte da API do tkinter usada pelo tabuleiro. """
+    def __init__(self, *args, **kwargs):
+        self.bindings = {}
+
+    def pack(self, *args, **kwargs):
+        pass
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def config(self, **kwargs):
+        pass
+
+    configure = config
+
+    def title(self, *args):
+        pass
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def after(self, ms, func, *args):
+        return "after#0"
+
+    def after_cancel(self, after_id):
+        pass
+
+    def protocol(self, *args):
+        pass
+
+    def destroy(self):
+        pass
+
+class StubCanvas(StubWidget):
+    """ Canvas que apenas guarda os itens em um dicionário. """
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.items = {}
+        self.ids = itertools.count(1)
+
+    def create_item(self, kind, coords, options):
+        item = next(self.ids)
+        self.items[item] = [kind, coords, options]
+        return item
+
+    def create_rectangle(self, *coords, **options):
+        return self.create_item("rectangle", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self.create_item("text", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self.create_item("image", coords, options)
+
+    def coords(self, item, *coords):
+        if coords:
+            self.items[item][1] = coords
+        return self.items[item][1]
+
+    def itemconfig(self, item, **options):
+        self.items[item][2].update(options)
+
+    itemconfigure = itemconfig
+
+    def delete(self, *items):
+        for item in items:
+            if item == "all":
+                self.items.clear()
+            else:
+                self.items.pop(item, None)
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def tag_raise(self, *args):
+        pass
+
+class StubPhotoImage:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def put(self, *args, **kwargs):
+        pass
+
+STUB_TK = types.SimpleNamespace(Tk=StubWidget, Label=StubWidget, Canvas=StubCanvas, PhotoImage=StubPhotoImage)
+
+
+def measure(func, repeat):
+    """
+    Executa `func` `repeat` vezes e resume os tempos em microssegundos.
+
+    :return: Dicionário com mediana, p95 e média.
+    :rtype: dict
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return summarize(samples)
+
+def summarize(samples):
+    """ Resume amostras em microssegundos (mediana, p95 e média). """
+    samples = sorted(samples)
+    return {
+        "median_us": statistics.median(samples),
+        "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "mean_us": statistics.fmean(samples),
+        "samples": len(samples)
+    }
+
+
+class GuiBench:
+    """ Cria tabuleiros com o tkinter real ou com o stub. """
+    def __init__(self, use_tk):
+        import run
+        self.run = run
+        if use_tk:
+            import tkinter
+            self.tk = tkinter
+            self.root = tkinter.Tk()
+        else:
+            run.tk = STUB_TK  # O tabuleiro passa a criar widgets stub
+            self.tk = STUB_TK
+            self.root = StubWidget()
+        # As imagens dos tiles (Pillow) precisam de um Tk de verdade
+        self.use_sprites = None if use_tk else False
+        self.seeds = itertools.count()
+
+    def new_board(self, draw=True, grid_size=6):
+        if hasattr(self.root, "children"):
+            for child in list(self.root.children.values()):
+                child.destroy()
+        board = self.run.ForbiddenIslandBoard(self.root, state=GameState(4, grid_size, seed=next(self.seeds)),
+                                           use_sprites=self.use_sprites)
+        if draw:
+            board.draw_grid()
+            board.highlight_current_player()
+        return board
+
+    def close(self):
+        if self.tk is not STUB_TK:
+            self.root.destroy()
+
+
+def bench_moves(bench, repeat, grid_size=6):
+    """ Latência de move_player, recomeçando a partida quando ela termina. """
+    board = bench.new_board(grid_size=grid_size)
+
+    def one_move():
+        nonlocal board
+        if board.state.is_over():
+            board = bench.new_board(grid_size=grid_size)
+        directions = board.state.valid_directions()
+        if directions:
+            board.move_player(directions[board.state.turn_count % len(directions)])
+        else:
+            board.state.pass_turn()
+    return measure(one_move, repeat), board
+
+def bench_input_burst(bench, repeat, burst=20):
+    """ Um frame após uma rajada de teclas e movimentos do mouse, como com a tecla presa. """
+    board = bench.new_board()
+    event = types.SimpleNamespace(x=0, y=0)
+
+    def one_frame():
+        nonlocal board
+        if board.state.is_over():
+            board = bench.new_board()
+        directions = board.state.valid_directions() or ["norte"]
+        for index in range(burst):
+            board.queue_move(directions[index % len(directions)])
+            event.x = index
+            board.on_mouse_move(event)
+        board.process_frame()
+    return measure(one_frame, repeat)
+
+def bench_gui(use_tk, repeat):
+    bench = GuiBench(use_tk)
+    results = {}
+    results["board_setup"] = measure(lambda: bench.new_board(draw=False), max(1, repeat // 20))
+
+    boards = [bench.new_board(draw=False) for _ in range(max(1, repeat // 20))]
+    pending = iter(boards)
+    results["draw_grid"] = measure(lambda: next(pending).draw_grid(), len(boards))
+
+    results["move_latency"], board = bench_moves(bench, repeat)
+    # Com itens persistentes, o número de itens não cresce com os movimentos; conta no próprio canvas
+    board.render()
+    results["canvas_items_after_moves"] = len(board.canvas.find_all())
+    results["input_burst_frame"] = bench_input_burst(bench, max(1, repeat // 4))
+
+    board = bench.new_board()
+    terrains = itertools.cycle(list(board.state.terrain_cells))
+    results["redraw_tile"] = measure(lambda: board.redraw_tile(next(terrains)), repeat)
+    sizes = itertools.cycle((100, 110))
+    results["zoom"] = measure(lambda: board.set_tile_size(next(sizes)), max(1, repeat // 20))
+
+    large = f"{LARGE_GRID}x{LARGE_GRID}"
+    boards = [bench.new_board(draw=False, grid_size=LARGE_GRID) for _ in range(max(1, repeat // 200))]
+    pending = iter(boards)
+    results[f"draw_grid_{large}"] = measure(lambda: next(pending).draw_grid(), len(boards))
+    results[f"move_latency_{large}"], _ = bench_moves(bench, repeat, LARGE_GRID)
+    bench.close()
+    return results
+
+def bench_engine(repeat):
+    results = {}
+    seeds = itertools.count()
+    results["state_setup"] = measure(lambda: GameState(4, seed=next(seeds)), repeat)
+    results[f"state_setup_{LARGE_GRID}x{LARGE_GRID}"] = measure(
+        lambda: GameState(4, LARGE_GRID, seed=next(seeds)), max(1, repeat // 10))
+
+    games = max(1, repeat // 2)
+    start = time.perf_counter()
+    for seed in range(games):
+        play_game(seed, 4, greedy_policy)
+    elapsed = time.perf_counter() - start
+    results["headless_games_per_second"] = games / elapsed
+    return results
+
+
+def bench_imports(runs=5):
+    """
+    Mede a importação de cada módulo de IMPORT_BUDGET_MS em um interpretador novo.
+
+    :return: Resultados por módulo e, em "import_loads_tkinter", quantos deles carregam o tkinter.
+    :rtype: dict
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    loads_tkinter = 0
+    for module in IMPORT_BUDGET_MS:
+        samples = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(module=module)], cwd=root,
+                                    capture_output=True, text=True, check=True).stdout.split()
+            samples.append(float(output[0]))
+            tkinter_loaded = output[1] == "True"
+        loads_tkinter += tkinter_loaded
+        results[f"import_{module}"] = summarize(samples)
+    results["import_loads_tkinter"] = loads_tkinter
+    return results
+
+def check_import_budget(results):
+    """
+    Confere as importações contra IMPORT_BUDGET_MS.
+
+    :return: Lista de mensagens de estouro; vazia se está tudo dentro do orçamento.
+    :rtype: list
+    """
+    problems = []
+    for module, budget_ms in IMPORT_BUDGET_MS.items():
+        median_ms = results[f"import_{module}"]["median_us"] / 1000
+        if median_ms > budget_ms:
+            problems.append(f"import {module}: {median_ms:.1f} ms > {budget_ms} ms")
+    if results["import_loads_tkinter"]:
+        problems.append("algum módulo importa o tkinter ao ser importado")
+    return problems
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compara resultados com a referência.
+
+    :return: Lista de mensagens de regressão; vazia se está tudo dentro da folga.
+    :rtype: list
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if isinstance(current, dict):
+            limit = max(reference["median_us"] * (1 + tolerance), reference["median_us"] + MIN_SLACK_US)
+            if current["median_us"] > limit:
+                regressions.append(f"{name}: mediana {current['median_us']:.1f} us > {limit:.1f} us")
+        elif name.endswith("_per_second"):
+            limit = reference * (1 - tolerance)
+            if current < limit:
+                regressions.append(f"{name}: {current:.0f} < {limit:.0f}")
+        elif current > reference:
+            regressions.append(f"{name}: {current} > {reference}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks da Ilha Proibida")
+    parser.add_argument("--tk", action="store_true", help="usa o tkinter real (requer display, por exemplo xvfb-run)")
+    parser.add_argument("--repeat", type=int, default=2000, help="repetições por medida")
+    parser.add_argument("--output", default=RESULTS_PATH, help="arquivo JSON com os resultados")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="arquivo JSON com a referência")
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como nova referência")
+    parser.add_argument("--check", action="store_true", help="falha se houver regressão em relação à referência")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="folga relativa aceita")
+    args = parser.parse_args(argv)
+
+    results = {}
+    results.update(bench_imports())
+    results.update(bench_engine(args.repeat))
+    results.update(bench_gui(args.tk, args.repeat))
+    report = {
+        "python": sys.version.split()[0],
+        "canvas": "tk" if args.tk else "stub",
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+
+    for name, value in results.items():
+        if isinstance(value, dict):
+            print(f"{name:28s} mediana {value['median_us']:9.1f} us   p95 {value['p95_us']:9.1f} us")
+        else:
+            print(f"{name:28s} {value:12.1f}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Referência gravada em {args.baseline}")
+
+    over_budget = check_import_budget(results)
+    for message in over_budget:
+        print("ORÇAMENTO " + message)
+
+    if args.check:
+        if over_budget:
+            return 1
+        if not os.path.exists(args.baseline):
+            print(f"Sem referência em {args.baseline}; rode antes com --save-baseline")
+            return 2
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("canvas") != report["canvas"]:
+            print("A referência foi gravada com outro canvas; as medidas não são comparáveis")
+            return 2
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for message in regressions:
+            print("REGRESSÃO " + message)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
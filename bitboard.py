@@ -0,0 +1,176 @@
+"""
+Representação compacta do estado da ilha em bitmasks.
+
+Cada célula do grid N x N corresponde a um bit (tile_number - 1). As
+máscaras de tiles jogáveis, afundando, afundados e ocupados são inteiros
+Python; as posições dos jogadores são índices de célula. Copiar o estado
+custa alguns inteiros e o estado inteiro serve de chave em dicionários.
+
+Todo GameState mantém um IslandBits em `state.bits`, atualizado a cada
+movimento e inundação. GameState.copy o copia por poucos inteiros, e
+GameState.state_key usa key() como chave da tabela de transposição do bot.
+"""
+from functools import lru_cache
+
+from constants import DIRECTION_OFFSETS
+
+
+@lru_cache(maxsize=None)
+def neighbor_masks(grid_size):
+    """
+    Pré-calcula, para cada célula, as células vizinhas em cada direção.
+
+    :param grid_size: Tamanho do grid.
+    :return: Tupla (máscaras de vizinhança por célula, {direção: tupla de célula vizinha ou -1}).
+    :rtype: tuple
+    """
+    masks = []
+    steps = {direction: [] for direction in DIRECTION_OFFSETS}
+    for cell in range(grid_size * grid_size):
+        row, col = divmod(cell, grid_size)
+        mask = 0
+        for direction, (d_row, d_col) in DIRECTION_OFFSETS.items():
+            n_row, n_col = row + d_row, col + d_col
+            if 0 <= n_row < grid_size and 0 <= n_col < grid_size:
+                neighbor = n_row * grid_size + n_col
+                mask |= 1 << neighbor
+                steps[direction].append(neighbor)
+            else:
+                steps[direction].append(-1)
+        masks.append(mask)
+    return tuple(masks), {direction: tuple(cells) for direction, cells in steps.items()}
+
+
+class IslandBits:
+    """
+    Estado da ilha em bitmasks.
+
+    :param grid_size: Tamanho do grid.
+    :param playable: Máscara dos tiles que fazem parte da ilha.
+    :param sinking: Máscara dos tiles afundando.
+    :param sunk: Máscara dos tiles afundados.
+    :param positions: Células dos jogadores, na ordem de player_roles.
+    """
+    __slots__ = ("grid_size", "playable", "sinking", "sunk", "occupied", "positions")
+
+    def __init__(self, grid_size, playable, sinking=0, sunk=0, positions=()):
+        self.grid_size = grid_size
+        self.playable = playable
+        self.sinking = sinking
+        self.sunk = sunk
+        self.positions = tuple(positions)
+        self.occupied = 0
+        for cell in self.positions:
+            self.occupied |= 1 << cell
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Converte um GameState para bitmasks.
+
+        :param state: Estado do jogo.
+        :type state: GameState
+        :rtype: IslandBits
+        """
+        playable = 0
+        for terrain_name in state.terrain_cells:
+            playable |= 1 << (state.tile_number_of(terrain_name) - 1)
+        sinking = 0
+        for tile_number in state.sinking_tiles:
+            sinking |= 1 << (tile_number - 1)
+        sunk = 0
+        for tile_number in state.sunk_tiles:
+            sunk |= 1 << (tile_number - 1)
+        positions = [state.tile_number_of(state.player_positions[role]) - 1 for role in state.player_roles]
+        return cls(state.grid_size, playable, sinking, sunk, positions)
+
+    def copy(self):
+        """ Cópia rasa: apenas inteiros e uma tupla imutável. """
+        bits = IslandBits.__new__(IslandBits)
+        bits.grid_size = self.grid_size
+        bits.playable = self.playable
+        bits.sinking = self.sinking
+        bits.sunk = self.sunk
+        bits.occupied = self.occupied
+        bits.positions = self.positions
+        return bits
+
+    @property
+    def walkable(self):
+        """ Máscara dos tiles que podem receber jogadores: alagados ainda podem, afundados não (GameState.is_walkable). """
+        return self.playable & ~self.sunk
+
+    def status(self, cell):
+        """ Retorna o status da célula no mesmo formato de GameState.tile_status. """
+        bit = 1 << cell
+        if self.sunk & bit:
+            return "Afundado"
+        if self.sinking & bit:
+            return "Afundando"
+        return "Normal"
+
+    def valid_moves(self, player_index):
+        """ Máscara das células para onde o jogador pode andar em um passo. """
+        masks, _ = neighbor_masks(self.grid_size)
+        return masks[self.positions[player_index]] & self.walkable
+
+    def move(self, player_index, direction):
+        """
+        Move o jogador uma célula na direção indicada, se possível.
+
+        :param player_index: Índice do jogador em player_roles.
+        :param direction: "norte", "sul", "leste" ou "oeste".
+        :return: True se o movimento foi feito.
+        :rtype: bool
+        """
+        _, steps = neighbor_masks(self.grid_size)
+        cell = self.positions[player_index]
+        target = steps[direction][cell]
+        if target < 0 or not (self.walkable >> target) & 1:
+            return False
+        self.move_to(player_index, target)
+        return True
+
+    def move_to(self, player_index, target):
+        """ Coloca o jogador na célula indicada, sem validar o movimento. """
+        positions = list(self.positions)
+        positions[player_index] = target
+        self.positions = tuple(positions)
+        self.occupied = 0
+        for cell in self.positions:
+            self.occupied |= 1 << cell
+
+    def flood(self, cell):
+        """
+        Avança o status da célula: Normal -> Afundando -> Afundado.
+
+        :return: Novo status da célula.
+        :rtype: str
+        """
+        bit = 1 << cell
+        if self.sinking & bit:
+            self.sinking ^= bit
+            self.sunk |= bit
+        elif not self.sunk & bit:
+            self.sinking |= bit
+        return self.status(cell)
+
+    def set_status(self, cell, status):
+        """ Define o status da célula a partir de um status de GameState.tile_status. """
+        bit = 1 << cell
+        self.sinking &= ~bit
+        self.sunk &= ~bit
+        if status == "Afundando":
+            self.sinking |= bit
+        elif status == "Afundado":
+            self.sunk |= bit
+
+    def key(self):
+        """ Chave hashable do estado, para tabelas de transposição. """
+        return self.playable, self.sinking, self.sunk, self.positions
+
+    def __eq__(self, other):
+        return isinstance(other, IslandBits) and self.grid_size == other.grid_size and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
@@ -0,0 +1,198 @@
+"""
+Cliente do servidor de partidas (server.py).
+
+O cliente mantém uma cópia local do GameState da mesa, criada a partir
+do snapshot do JOIN e atualizada pelas diferenças que o servidor envia.
+A cópia emite os mesmos eventos para os listeners que um jogo local,
+então o ForbiddenIslandBoard a desenha sem saber que a partida é
+remota. As linhas chegam por uma thread de leitura e só são aplicadas
+em poll(), chamado pela thread do tabuleiro a cada frame.
+"""
+import base64
+import queue
+import socket
+import threading
+
+import game_logging
+from engine import GameState
+from replay import ACTION_CODES, CODE_ACTIONS
+from server import DEFAULT_HOST, DEFAULT_PORT, REPLY_KINDS
+
+log = game_logging.get_logger("client")
+
+
+def apply_diff(state, line):
+    """
+    Aplica uma linha de diferença do servidor à cópia local do estado.
+
+    :param state: Cópia local da mesa.
+    :type state: GameState
+    :param line: Linha recebida, sem o "\\n".
+    """
+    kind, *fields = line.split(" ")
+    if kind == "A":
+        state.notify("action", CODE_ACTIONS[fields[0]])
+    elif kind == "M":
+        role, old_tile, new_tile = fields[0], int(fields[1]), int(fields[2])
+        old_terrain = state.cell_terrains[divmod(old_tile - 1, state.grid_size)]
+        new_terrain = state.cell_terrains[divmod(new_tile - 1, state.grid_size)]
+        state.player_positions[role] = new_terrain
+        state.bits.move_to(state.player_roles.index(role), new_tile - 1)
+        state.capture_treasure(new_terrain)
+        state.notify("player_moved", role, old_terrain, new_terrain)
+    elif kind == "T":
+        tile_number, status = int(fields[0]), fields[1]
+        if status == "Afundado":
+            state.sinking_tiles.discard(tile_number)
+            state.sunk_tiles.add(tile_number)
+            state.sink_order.append(state.cell_terrains[divmod(tile_number - 1, state.grid_size)])
+        elif status == "Afundando":
+            state.sinking_tiles.add(tile_number)
+        else:
+            state.sinking_tiles.discard(tile_number)
+            state.sunk_tiles.discard(tile_number)
+        state.bits.set_status(tile_number - 1, status)
+        state.notify("tile_status", tile_number, status)
+    elif kind == "D":
+        state.drowned_players.add(fields[0])
+        state.notify("player_drowned", fields[0])
+    elif kind == "V":
+        state.next_turn()
+    elif kind == "W":
+        state.water_level = int(fields[0])
+        state.notify("water_level", state.water_level)
+    else:
+        log.warning("Linha desconhecida do servidor: %s", line)
+
+
+class GameClient:
+    """
+    Conexão com o servidor de partidas.
+
+    :param host: Endereço do servidor.
+    :param port: Porta do servidor.
+    :param timeout: Tempo máximo, em segundos, para conectar e para esperar respostas.
+    """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5.0):
+        self.timeout = timeout
+        self.socket = socket.create_connection((host, port), timeout)
+        self.socket.settimeout(None)
+        self.lines = queue.Queue()
+        self.state = None
+        self.table_id = None
+        self.pending_moves = 0  # MOVEs enviados cuja resposta ainda não chegou
+        self.errors = []  # Respostas de erro dos MOVEs
+        self.reader = threading.Thread(target=self.read_loop, daemon=True)
+        self.reader.start()
+
+    def read_loop(self):
+        with self.socket.makefile("r", encoding="utf-8", newline="\n") as stream:
+            try:
+                for line in stream:
+                    self.lines.put(line.rstrip("\n"))
+            except OSError:
+                pass
+        self.lines.put(None)  # Conexão encerrada
+
+    def send(self, *words):
+        self.socket.sendall((" ".join(map(str, words)) + "\n").encode("utf-8"))
+
+    def handle_line(self, line):
+        """
+        Aplica uma diferença ou trata a resposta de um MOVE.
+
+        :return: A linha, se for a resposta de outro comando; senão None.
+        """
+        if line.split(" ", 1)[0] not in REPLY_KINDS:
+            if self.state is not None:
+                apply_diff(self.state, line)
+            return None
+        if self.pending_moves:
+            self.pending_moves -= 1
+            if line.startswith("E "):
+                log.warning("Movimento recusado: %s", line[2:])
+                self.errors.append(line[2:])
+            return None
+        return line
+
+    def request(self, *words):
+        """
+        Envia um comando e espera a sua resposta, aplicando as diferenças
+        que chegarem antes dela.
+
+        :return: Palavras da resposta, sem o tipo.
+        :rtype: list
+        :raises ValueError: Se o servidor recusar o comando.
+        :raises ConnectionError: Se a conexão cair ou a resposta demorar.
+        """
+        self.send(*words)
+        while True:
+            try:
+                line = self.lines.get(timeout=self.timeout)
+            except queue.Empty:
+                raise ConnectionError(f"Sem resposta do servidor para {words[0]}") from None
+            if line is None:
+                raise ConnectionError("Conexão encerrada pelo servidor")
+            reply = self.handle_line(line)
+            if reply is not None:
+                kind, _, rest = reply.partition(" ")
+                if kind == "E":
+                    raise ValueError(rest)
+                return rest.split()
+
+    def create_table(self, num_players, grid_size=6, seed=None):
+        """ Cria uma mesa no servidor e retorna o seu número. """
+        args = [num_players, grid_size] + ([seed] if seed is not None else [])
+        return int(self.request("NEW", *args)[0])
+
+    def join(self, table_id, role=None):
+        """
+        Entra em uma mesa.
+
+        :param table_id: Número da mesa.
+        :param role: Papel controlado por este cliente; sem ele, todos.
+        :return: Cópia local do estado da mesa.
+        :rtype: GameState
+        """
+        reply = self.request("JOIN", table_id, *([role] if role is not None else []))
+        self.table_id = int(reply[0])
+        self.state = GameState.from_bytes(base64.b64decode(reply[1]))
+        return self.state
+
+    def add_bot(self, role):
+        """ Entrega um papel sem jogador ao bot do servidor. """
+        self.request("BOT", role)
+
+    def list_tables(self):
+        return [int(table_id) for table_id in self.request("LIST")]
+
+    def send_move(self, direction):
+        """ Envia a ação sem esperar; o resultado chega como diferenças em poll(). """
+        self.pending_moves += 1
+        self.send("MOVE", ACTION_CODES[direction])
+
+    def poll(self):
+        """
+        Aplica as linhas recebidas até agora, sem bloquear.
+
+        :return: Número de linhas processadas.
+        :rtype: int
+        """
+        count = 0
+        while True:
+            try:
+                line = self.lines.get_nowait()
+            except queue.Empty:
+                return count
+            if line is None:
+                self.lines.put(None)  # Mantém o aviso para as próximas chamadas
+                return count
+            self.handle_line(line)
+            count += 1
+
+    def close(self):
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
@@ -0,0 +1,92 @@
+"""
+Dados fixos do jogo 'Ilha Proibida': terrenos, tesouros, papéis e
+direções. Só constantes, sem importações nem efeitos colaterais, para
+que ferramentas e processos de trabalho possam lê-las sem carregar o
+motor ou a interface.
+"""
+
+TERRAIN_NAMES = (
+    "Jardim Sussurrante", "Jardim Uivante", "Caverna das Sombras",
+    "Caverna das Chamas", "Palácio de Coral", "Palácio das Marés",
+    "Templo da Lua", "Templo do Sol", "Rocha Fantasma",
+    "Floresta Carmesim", "Clareira do Crepúsculo", "Torre de Vigia",
+    "Pântano de Pavor", "Portal de Prata", "Portal de Bronze",
+    "Portal de Ferro", "Portal de Ouro", "Portal de Cobre",
+    "Observatório", "Heliponto", "Caverna do Vórtice", "Templo do Vento",
+    "Templo do Fogo", "Caverna da Onda"
+)
+
+TREASURE_NAMES = ("Cálice da Maré", "Cristal de Fogo", "Estátua de Pedra", "Orbe Terrestre")
+
+ROLES = ("Piloto", "Engenheiro", "Explorador", "Mergulhador", "Mensageiro", "Navegador")
+
+ROLE_STARTING_POINTS = {
+    "Piloto": "Heliponto",
+    "Engenheiro": "Portal de Bronze",
+    "Explorador": "Portal de Cobre",
+    "Mergulhador": "Portal de Ferro",
+    "Mensageiro": "Portal de Prata",
+    "Navegador": "Portal de Ouro"
+}
+
+TERRAIN_TREASURE_MAPPING = {
+    "Jardim Sussurrante": "Cálice da Maré",
+    "Jardim Uivante": "Cálice da Maré",
+    "Caverna das Sombras": "Estátua de Pedra",
+    "Caverna das Chamas": "Estátua de Pedra",
+    "Palácio de Coral": "Cristal de Fogo",
+    "Palácio das Marés": "Cristal de Fogo",
+    "Templo da Lua": "Orbe Terrestre",
+    "Templo do Sol": "Orbe Terrestre"
+}
+
+# Terrenos de cada tesouro, derivado do mapeamento acima
+TREASURE_TERRAINS = {
+    treasure: tuple(terrain for terrain, mapped in TERRAIN_TREASURE_MAPPING.items() if mapped == treasure)
+    for treasure in TREASURE_NAMES
+}
+
+# Índices estáveis usados na serialização do estado
+TERRAIN_INDEX = {name: index for index, name in enumerate(TERRAIN_NAMES)}
+TREASURE_INDEX = {name: index for index, name in enumerate(TREASURE_NAMES)}
+ROLE_INDEX = {name: index for index, name in enumerate(ROLES)}
+
+# Terreno onde os jogadores se reúnem para escapar da ilha
+ESCAPE_TERRAIN = "Heliponto"
+
+# Tiles fora da ilha no grid 6x6 (numeração a partir de 1, linha a linha);
+# outros tamanhos de grid são gerados por layout.generate_layout
+BLACK_TILES_NUMBERS = frozenset({1, 2, 5, 6, 7, 12, 25, 30, 31, 32, 35, 36})
+
+# Terrenos que existem em qualquer tamanho de ilha
+REQUIRED_TERRAINS = tuple(name for name in TERRAIN_NAMES
+                          if name in ROLE_STARTING_POINTS.values()
+                          or name in TERRAIN_TREASURE_MAPPING
+                          or name == ESCAPE_TERRAIN)
+
+DIRECTIONS = ("norte", "sul", "leste", "oeste")
+
+# Deslocamento (linha, coluna) de cada direção
+DIRECTION_OFFSETS = {
+    "norte": (-1, 0),
+    "sul": (1, 0),
+    "leste": (0, 1),
+    "oeste": (0, -1)
+}
+
+# Cores dos tesouros e das peças de cada papel no tabuleiro
+TREASURE_COLORS = {
+    "Cálice da Maré": "#800080",
+    "Cristal de Fogo": "#FF8C00",
+    "Estátua de Pedra": "#8B4513",
+    "Orbe Terrestre": "#006400"
+}
+
+PLAYER_COLORS = {
+    "Piloto": "#0000FF",         # Azul
+    "Engenheiro": "#FF0000",     # Vermelho
+    "Explorador": "#008000",     # Verde
+    "Mergulhador": "#000000",    # Preto
+    "Mensageiro": "#505050",     # Cinza
+    "Navegador": "#DAA520"       # Amarelo Escuro
+}
@@ -0,0 +1,621 @@
+"""
+Motor de regras do jogo 'Ilha Proibida', independente do tkinter.
+"""
+import random
+import struct
+
+import game_logging
+from bitboard import IslandBits
+from profiling import timed
+from layout import extra_terrain_index, extra_terrain_name, generate_layout
+from flood import MAX_WATER_LEVEL, WATER_LEVEL_DRAWS, WATER_RISE_INTERVAL, FloodDeck
+from constants import (DIRECTION_OFFSETS, ESCAPE_TERRAIN, REQUIRED_TERRAINS, ROLE_INDEX, ROLE_STARTING_POINTS,
+                       ROLES, TERRAIN_INDEX, TERRAIN_NAMES, TERRAIN_TREASURE_MAPPING, TREASURE_INDEX,
+                       TREASURE_NAMES, TREASURE_TERRAINS)
+
+log = game_logging.get_logger("engine")
+
+# Cabeçalho do snapshot: assinatura, versão, grid, jogadores, semente, índice do turno,
+# turnos jogados, nível da água, tesouros capturados (bits), jogadores afogados (bits)
+# e reembaralhamentos do baralho de inundação
+SNAPSHOT_HEADER = struct.Struct("<4sBBBQBIBBBH")
+SNAPSHOT_MAGIC = b"ILHA"
+SNAPSHOT_VERSION = 2
+SEA_CODE = 0xFFFF  # Célula fora da ilha no snapshot
+
+# Limites impostos pelo cabeçalho do snapshot (grid em um byte, semente em oito)
+MAX_GRID_SIZE = 0xFF
+MAX_SEED = 2 ** 64 - 1
+
+# Tabelas de disposição (células e vizinhos) já montadas, por disposição serializada.
+# A disposição não muda durante a partida, então snapshots da mesma partida as compartilham.
+LAYOUT_CACHE = {}
+LAYOUT_CACHE_SIZE = 4096
+
+
+def pack_numbers(numbers):
+    """ Empacota uma lista de inteiros de 16 bits precedida do seu tamanho. """
+    return struct.pack(f"<H{len(numbers)}H", len(numbers), *numbers)
+
+def unpack_numbers(data, offset):
+    """
+    Lê uma lista gravada por pack_numbers.
+
+    :return: Tupla (lista de inteiros, próximo offset).
+    :rtype: tuple
+    """
+    (count,) = struct.unpack_from("<H", data, offset)
+    numbers = list(struct.unpack_from(f"<{count}H", data, offset + 2))
+    return numbers, offset + 2 + 2 * count
+
+def island_layout(grid_size):
+    """ Disposição da ilha (mar e terrenos) para o tamanho de grid. """
+    return generate_layout(grid_size, TERRAIN_NAMES, REQUIRED_TERRAINS)
+
+def terrain_code(terrain_name):
+    """ Código estável de um terreno, usado nos snapshots. """
+    code = TERRAIN_INDEX.get(terrain_name)
+    if code is None:
+        code = len(TERRAIN_NAMES) + extra_terrain_index(terrain_name)
+    return code
+
+def terrain_from_code(code):
+    """ Inverso de terrain_code. """
+    if code < len(TERRAIN_NAMES):
+        return TERRAIN_NAMES[code]
+    return extra_terrain_name(code - len(TERRAIN_NAMES))
+
+# Decorator para atribuição de nomes aos terrenos
+def assign_names_decorator(func):
+    """
+    Decorator para inicializar e embaralhar os nomes dos terrenos.
+
+    :param func: Função a ser decorada.
+    :type func: function
+    :return: Função decorada com inicialização de nomes dos terrenos.
+    :rtype: function
+    """
+    def wrapper(self, *args, **kwargs):
+        self.terrain_names = list(island_layout(self.grid_size).terrain_names)
+        self.rng.shuffle(self.terrain_names)
+        return func(self, *args, **kwargs)
+    return wrapper
+
+# Decorator para tesouros nas diagonais
+def treasure_decorator(func):
+    """
+    Decorator para criar e embaralhar os nomes dos tesouros.
+
+    :param func: Função a ser decorada.
+    :type func: function
+    :return: Função decorada com inicialização de nomes dos tesouros.
+    :rtype: function
+    """
+    def wrapper(self, *args, **kwargs):
+        self.treasure_names = list(TREASURE_NAMES)
+        self.rng.shuffle(self.treasure_names)
+        return func(self, *args, **kwargs)
+    return wrapper
+
+class GameState:
+    """
+    Estado do jogo 'Ilha Proibida': disposição dos terrenos, status dos tiles,
+    posições dos jogadores e ordem dos turnos. Não depende do tkinter, podendo
+    ser usado em simulações sem display.
+
+    :param num_players: Número de jogadores (2, 3 ou 4).
+    :type num_players: int
+    :param grid_size: Tamanho do grid do tabuleiro.
+    :type grid_size: int
+    :param seed: Semente da partida; a mesma semente gera a mesma partida.
+    :type seed: int
+    """
+    def __init__(self, num_players, grid_size=6, seed=None):
+        """
+        Inicializador da classe GameState.
+
+        :param num_players: Número de jogadores.
+        :param grid_size: Tamanho do grid, padrão é 6.
+        :param seed: Semente da partida, de 0 a MAX_SEED; se omitida, uma é sorteada.
+        :raises ValueError: Se a semente ou o grid não couberem no snapshot, ou se o grid for pequeno demais.
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"A semente deve estar entre 0 e {MAX_SEED}")
+        if grid_size > MAX_GRID_SIZE:
+            raise ValueError(f"O grid pode ter no máximo {MAX_GRID_SIZE} tiles de lado")
+        self.seed = seed
+        # Todo sorteio da partida passa por este gerador, nunca pelo global
+        self.rng = random.Random(seed)
+        self.grid_size = grid_size
+        self.num_players = num_players
+        layout = island_layout(grid_size)
+        self.black_tiles_numbers = set(layout.black_tiles_numbers)
+        self.initialize_terrain_names()
+        self.initialize_treasures()
+        # Inicialmente, não há terrenos com status especial
+        self.sunk_tiles = set()
+        self.sinking_tiles = set()
+        self.terrain_cells = {}  # Nome do terreno -> (linha, coluna)
+        self.cell_terrains = {}  # (linha, coluna) -> nome do terreno
+        self.neighbors = {}  # Nome do terreno -> {direção: terreno vizinho}
+        self.deal_layout()
+        self.assign_roles_randomly()
+        self.player_positions = {}  # Dicionário para manter as posições dos jogadores
+        self.set_initial_positions()
+        # Tiles e posições também em bitmasks, mantidos junto com os conjuntos acima
+        self.bits = IslandBits.from_state(self)
+
+        self.player_turn_order = self.rng.sample(self.player_roles, len(self.player_roles))
+        self.current_turn_index = 0
+        self.turn_count = 0
+
+        self.captured_treasures = set()
+        self.sink_order = []  # Terrenos na ordem em que afundaram
+        self.drowned_players = set()
+
+        self.water_level = 1
+        self.flood_deck = FloodDeck(map(self.tile_number_of, self.terrain_cells), self.rng, seed)
+
+        # Funções chamadas a cada mudança de estado: listener(evento, *args)
+        self.listeners = []
+
+        log.debug("Semente da partida: %d", self.seed)
+        log.debug("Ordem dos turnos dos jogadores: %s", self.player_turn_order)
+        log.debug("É a vez do jogador: %s", self.player_turn_order[0])
+
+    def to_bytes(self):
+        """
+        Serializa o estado em um formato binário compacto e de layout fixo:
+        disposição dos terrenos, status dos tiles, papéis, posições, turno,
+        tesouros, baralho de inundação (com o número de reembaralhamentos)
+        e ordem de afundamento. Listeners
+        (como o tabuleiro tkinter) não fazem parte do snapshot.
+
+        :rtype: bytes
+        """
+        cells = self.grid_size * self.grid_size
+        terrain_codes = [SEA_CODE] * cells
+        for terrain_name, (row, col) in self.terrain_cells.items():
+            terrain_codes[row * self.grid_size + col] = terrain_code(terrain_name)
+        statuses = bytearray(cells)
+        for tile_number in self.sinking_tiles:
+            statuses[tile_number - 1] = 1
+        for tile_number in self.sunk_tiles:
+            statuses[tile_number - 1] = 2
+        captured = sum(1 << TREASURE_INDEX[treasure] for treasure in self.captured_treasures)
+        drowned = sum(1 << index for index, role in enumerate(self.player_roles) if role in self.drowned_players)
+        positions = [self.tile_number_of(self.player_positions[role]) for role in self.player_roles]
+        sink_order = [self.tile_number_of(terrain_name) for terrain_name in self.sink_order]
+        num_roles = len(self.player_roles)
+        return b"".join((
+            SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.grid_size, num_roles, self.seed,
+                                 self.current_turn_index, self.turn_count, self.water_level, captured, drowned,
+                                 self.flood_deck.reshuffles),
+            struct.pack(f"<{cells}H", *terrain_codes),
+            bytes(statuses),
+            bytes(TREASURE_INDEX[treasure] for treasure in self.treasure_names),
+            bytes(ROLE_INDEX[role] for role in self.player_roles),
+            bytes(ROLE_INDEX[role] for role in self.player_turn_order),
+            struct.pack(f"<{num_roles}H", *positions),
+            pack_numbers(self.flood_deck.draw_pile),
+            pack_numbers(self.flood_deck.discard_pile),
+            pack_numbers(sink_order),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reconstrói um estado a partir de to_bytes(), sem refazer a preparação
+        da partida. Os reembaralhamentos do baralho dependem só da semente e
+        de quantos já foram feitos, de modo que o estado restaurado continua
+        exatamente como o original continuaria.
+
+        :param data: Bytes produzidos por to_bytes().
+        :rtype: GameState
+        """
+        data = memoryview(data)
+        (magic, version, grid_size, num_roles, seed, current_turn_index, turn_count,
+         water_level, captured, drowned, reshuffles) = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Snapshot inválido ou de versão incompatível")
+        offset = SNAPSHOT_HEADER.size
+        cells = grid_size * grid_size
+        layout_key = bytes(data[offset:offset + 2 * cells])
+        terrain_codes = struct.unpack_from(f"<{cells}H", data, offset)
+        offset += 2 * cells
+        statuses = data[offset:offset + cells]
+        offset += cells
+        num_treasures = len(TREASURE_NAMES)
+        treasure_codes = data[offset:offset + num_treasures]
+        offset += num_treasures
+        role_codes = data[offset:offset + num_roles]
+        offset += num_roles
+        order_codes = data[offset:offset + num_roles]
+        offset += num_roles
+        positions = struct.unpack_from(f"<{num_roles}H", data, offset)
+        offset += 2 * num_roles
+        draw_pile, offset = unpack_numbers(data, offset)
+        discard_pile, offset = unpack_numbers(data, offset)
+        sink_order, offset = unpack_numbers(data, offset)
+
+        state = cls.__new__(cls)
+        state.seed = seed
+        state.rng = random.Random(f"{seed}:{turn_count}")
+        state.grid_size = grid_size
+        state.num_players = num_roles
+        state.black_tiles_numbers = {cell + 1 for cell, code in enumerate(terrain_codes) if code == SEA_CODE}
+        state.terrain_names = [terrain_from_code(code) for code in terrain_codes if code != SEA_CODE]
+        state.treasure_names = [TREASURE_NAMES[code] for code in treasure_codes]
+        state.sinking_tiles = {cell + 1 for cell, status in enumerate(statuses) if status == 1}
+        state.sunk_tiles = {cell + 1 for cell, status in enumerate(statuses) if status == 2}
+        layout = LAYOUT_CACHE.get((grid_size, layout_key))
+        if layout is None:
+            state.terrain_cells = {}
+            state.cell_terrains = {}
+            state.neighbors = {}
+            state.deal_layout()
+            if len(LAYOUT_CACHE) >= LAYOUT_CACHE_SIZE:
+                LAYOUT_CACHE.clear()
+            LAYOUT_CACHE[(grid_size, layout_key)] = (state.terrain_cells, state.cell_terrains, state.neighbors)
+        else:
+            state.terrain_cells, state.cell_terrains, state.neighbors = layout
+        state.player_roles = [ROLES[code] for code in role_codes]
+        state.player_positions = {
+            role: state.cell_terrains[divmod(tile_number - 1, grid_size)]
+            for role, tile_number in zip(state.player_roles, positions)
+        }
+        state.player_turn_order = [ROLES[code] for code in order_codes]
+        state.current_turn_index = current_turn_index
+        state.turn_count = turn_count
+        state.captured_treasures = {treasure for treasure in TREASURE_NAMES if captured >> TREASURE_INDEX[treasure] & 1}
+        state.sink_order = [state.cell_terrains[divmod(tile_number - 1, grid_size)] for tile_number in sink_order]
+        state.drowned_players = {role for index, role in enumerate(state.player_roles) if drowned >> index & 1}
+        state.water_level = water_level
+        state.flood_deck = FloodDeck.from_piles(draw_pile, discard_pile, state.rng, seed, reshuffles)
+        state.bits = IslandBits.from_state(state)
+        state.listeners = []
+        return state
+
+    def __reduce__(self):
+        # pickle usa o snapshot compacto e deixa os listeners de fora
+        return GameState.from_bytes, (self.to_bytes(),)
+
+    def copy(self, rng=None):
+        """
+        Cópia rápida para busca e simulação. A disposição da ilha, que não
+        muda durante a partida, é compartilhada; tiles, posições, tesouros
+        e o baralho são duplicados, e os bitmasks (self.bits) custam alguns
+        inteiros. A cópia não tem listeners.
+
+        :param rng: Gerador da cópia, que passa a sortear os reembaralhamentos do
+            baralho (como numa partida cujas cartas são desconhecidas); sem ele, a
+            cópia tem um gerador no mesmo ponto do original e continua igual a ele.
+        :rtype: GameState
+        """
+        state = GameState.__new__(GameState)
+        state.__dict__.update(self.__dict__)
+        deck = self.flood_deck
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+            state.flood_deck = FloodDeck.from_piles(deck.draw_pile, deck.discard_pile, rng, deck.seed, deck.reshuffles)
+        else:
+            state.flood_deck = FloodDeck.from_piles(deck.draw_pile, deck.discard_pile, rng)
+        state.rng = rng
+        state.sinking_tiles = set(self.sinking_tiles)
+        state.sunk_tiles = set(self.sunk_tiles)
+        state.player_positions = dict(self.player_positions)
+        state.captured_treasures = set(self.captured_treasures)
+        state.sink_order = list(self.sink_order)
+        state.drowned_players = set(self.drowned_players)
+        state.bits = self.bits.copy()
+        state.listeners = []
+        return state
+
+    def state_key(self):
+        """
+        Chave do estado para tabelas de transposição: vez, nível da água,
+        tesouros capturados e a chave dos bitmasks (tiles e posições).
+
+        :rtype: tuple
+        """
+        return (self.current_turn_index, self.water_level, frozenset(self.captured_treasures)) + self.bits.key()
+
+    @assign_names_decorator
+    def initialize_terrain_names(self):
+        pass
+
+    @treasure_decorator
+    def initialize_treasures(self):
+        """ Método para inicializar os tesouros. """
+        pass  # O corpo deste método está vazio, pois a lógica está no decorator
+
+    def deal_layout(self):
+        """
+        Distribui os terrenos embaralhados pelos tiles jogáveis do grid e
+        monta os índices terreno <-> (linha, coluna) e a tabela de vizinhos.
+        """
+        terrain_index = 0
+        for row in range(self.grid_size):
+            for col in range(self.grid_size):
+                tile_number = row * self.grid_size + col + 1
+                if tile_number not in self.black_tiles_numbers:
+                    if terrain_index < len(self.terrain_names):
+                        terrain_name = self.terrain_names[terrain_index]
+                        self.terrain_cells[terrain_name] = (row, col)
+                        self.cell_terrains[(row, col)] = terrain_name
+                        terrain_index += 1
+                    else:
+                        log.error("Não há terrenos suficientes para o tile_number %d", tile_number)
+
+        for terrain_name, (row, col) in self.terrain_cells.items():
+            self.neighbors[terrain_name] = {
+                direction: self.cell_terrains[(row + d_row, col + d_col)]
+                for direction, (d_row, d_col) in DIRECTION_OFFSETS.items()
+                if (row + d_row, col + d_col) in self.cell_terrains
+            }
+
+    def assign_roles_randomly(self):
+        """ Atribui papéis aos jogadores de forma aleatória. """
+        roles = list(ROLES)
+        self.rng.shuffle(roles)
+        self.player_roles = roles[:self.num_players]  # Seleciona os papéis com base no número de jogadores
+        log.debug("Papéis atribuídos: %s", self.player_roles)
+
+    def set_initial_positions(self):
+        """ Define as posições iniciais dos jogadores com base em seus papéis. """
+        for role in self.player_roles:
+            starting_point = ROLE_STARTING_POINTS[role]
+            self.player_positions[role] = starting_point  # Define a posição inicial para cada papel
+            log.debug("%s começa em %s", role, starting_point)
+
+    def current_role(self):
+        """ Retorna o papel do jogador da vez. """
+        return self.player_turn_order[self.current_turn_index]
+
+    def tile_status(self, tile_number):
+        """
+        Retorna o status de um tile.
+
+        :param tile_number: Número do tile (a partir de 1).
+        :return: "Normal", "Afundando" ou "Afundado".
+        :rtype: str
+        """
+        if tile_number in self.sunk_tiles:
+            return "Afundado"
+        if tile_number in self.sinking_tiles:
+            return "Afundando"
+        return "Normal"
+
+    def notify(self, event, *args):
+        """
+        Avisa os listeners de uma mudança de estado. Eventos emitidos:
+        "action" (direção do movimento ou "passar"),
+        "tile_status" (número do tile, novo status),
+        "player_moved" (papel, terreno antigo, terreno novo),
+        "player_drowned" (papel),
+        "turn" (papel anterior, papel da vez) e
+        "water_level" (novo nível da água).
+        """
+        for listener in self.listeners:
+            listener(event, *args)
+
+    def flood_tile(self, tile_number):
+        """
+        Avança o status de um tile: Normal -> Afundando -> Afundado.
+        Jogadores em um tile que afunda nadam para um vizinho seguro.
+
+        :param tile_number: Número do tile (a partir de 1).
+        :return: Novo status do tile.
+        :rtype: str
+        """
+        if tile_number in self.sinking_tiles:
+            self.sinking_tiles.discard(tile_number)
+            self.sunk_tiles.add(tile_number)
+            terrain_name = self.cell_terrains[divmod(tile_number - 1, self.grid_size)]
+            self.sink_order.append(terrain_name)
+            self.bits.flood(tile_number - 1)
+            self.notify("tile_status", tile_number, "Afundado")
+            self.swim_to_safety(terrain_name)
+        elif tile_number not in self.sunk_tiles:
+            self.sinking_tiles.add(tile_number)
+            self.bits.flood(tile_number - 1)
+            self.notify("tile_status", tile_number, "Afundando")
+        return self.tile_status(tile_number)
+
+    def draw_flood_cards(self):
+        """
+        Compra as cartas de inundação do turno, conforme o nível da água, e
+        alaga os tiles correspondentes. Cartas de tiles que afundaram saem
+        do jogo; as demais vão para o descarte. O custo depende apenas do
+        nível da água, não do tamanho do tabuleiro.
+
+        :return: Números dos tiles cujo status mudou.
+        :rtype: list
+        """
+        changed = []
+        for _ in range(WATER_LEVEL_DRAWS[min(self.water_level, len(WATER_LEVEL_DRAWS)) - 1]):
+            tile_number = self.flood_deck.draw()
+            if tile_number is None:
+                break
+            if self.flood_tile(tile_number) != "Afundado":
+                self.flood_deck.discard(tile_number)
+            changed.append(tile_number)
+        return changed
+
+    def raise_water(self):
+        """ Sobe o nível da água e devolve o descarte ao topo do baralho. """
+        self.water_level += 1
+        self.flood_deck.reshuffle_discard()
+        self.notify("water_level", self.water_level)
+
+    def is_walkable(self, terrain_name):
+        """
+        Indica se um terreno pode receber jogadores. Como no jogo de
+        tabuleiro, tiles alagados (afundando) ainda podem ser pisados;
+        apenas os afundados ficam fora de alcance.
+        """
+        return self.tile_number_of(terrain_name) not in self.sunk_tiles
+
+    def swim_to_safety(self, terrain_name):
+        """ Move os jogadores de um terreno afundado para o primeiro vizinho seguro. """
+        for role, position in self.player_positions.items():
+            if position != terrain_name:
+                continue
+            safe = [neighbor for neighbor in self.neighbors[terrain_name].values() if self.is_walkable(neighbor)]
+            if safe:
+                self.player_positions[role] = safe[0]
+                self.bits.move_to(self.player_roles.index(role), self.tile_number_of(safe[0]) - 1)
+                self.capture_treasure(safe[0])
+                self.notify("player_moved", role, terrain_name, safe[0])
+            else:
+                self.drowned_players.add(role)
+                self.notify("player_drowned", role)
+
+    def capture_treasure(self, terrain_name):
+        """ Captura o tesouro associado ao terreno, se houver. """
+        treasure = TERRAIN_TREASURE_MAPPING.get(terrain_name)
+        if treasure is not None:
+            self.captured_treasures.add(treasure)
+
+    def is_won(self):
+        """ Todos os tesouros capturados e todos os jogadores no Heliponto. """
+        return (len(self.captured_treasures) == len(TREASURE_NAMES)
+                and all(position == ESCAPE_TERRAIN for position in self.player_positions.values()))
+
+    def is_lost(self):
+        """
+        O jogo é perdido se algum jogador se afogou, se a água chegou ao nível
+        máximo, se o Heliponto afundou ou se os dois terrenos de um tesouro
+        ainda não capturado afundaram.
+        """
+        if self.drowned_players or self.water_level >= MAX_WATER_LEVEL:
+            return True
+        if self.tile_number_of(ESCAPE_TERRAIN) in self.sunk_tiles:
+            return True
+        for treasure, terrains in TREASURE_TERRAINS.items():
+            if treasure not in self.captured_treasures and all(
+                    self.tile_number_of(terrain) in self.sunk_tiles for terrain in terrains):
+                return True
+        return False
+
+    def is_over(self):
+        """ Indica se a partida terminou, com vitória ou derrota. """
+        return self.is_won() or self.is_lost()
+
+    def valid_directions(self):
+        """ Retorna as direções em que o jogador da vez pode se mover. """
+        current_terrain = self.player_positions[self.current_role()]
+        return [direction for direction, neighbor in self.neighbors[current_terrain].items()
+                if self.is_walkable(neighbor)]
+
+    def legal_actions(self):
+        """
+        Todas as ações do jogador da vez: os movimentos aceitos por
+        is_move_valid e "passar". Vazio se a partida terminou.
+
+        :rtype: list
+        """
+        if self.is_over():
+            return []
+        return self.valid_directions() + ["passar"]
+
+    def apply_action(self, action):
+        """
+        Executa uma ação de legal_actions().
+
+        :param action: Direção ou "passar".
+        :return: True se a ação foi aceita.
+        :rtype: bool
+        """
+        if action == "passar":
+            self.pass_turn()
+            return True
+        return self.move_player(action) is not None
+
+    def tile_number_of(self, terrain_name):
+        """ Retorna o número do tile onde está o terreno, ou None. """
+        cell = self.terrain_cells.get(terrain_name)
+        if cell is None:
+            return None
+        return cell[0] * self.grid_size + cell[1] + 1
+
+    def get_grid_position(self, terrain_name):
+        """ Retorna a posição (linha, coluna) de um terreno no grid, ou None. """
+        return self.terrain_cells.get(terrain_name)
+
+    def calculate_new_position(self, current_terrain, direction):
+        """
+        Calcula o terreno vizinho na direção indicada.
+
+        :param current_terrain: Nome do terreno atual.
+        :param direction: "norte", "sul", "leste" ou "oeste".
+        :return: Nome do terreno vizinho ou None se não houver.
+        :rtype: str
+        """
+        neighbors = self.neighbors.get(current_terrain)
+        if neighbors is None:
+            return None
+        return neighbors.get(direction)
+
+    @timed("engine.is_move_valid")
+    def is_move_valid(self, current_terrain, direction):
+        """ Verifica se o jogador pode se mover do terreno atual na direção indicada. """
+        new_terrain = self.calculate_new_position(current_terrain, direction)
+        if new_terrain is None:
+            return False
+        if not self.is_walkable(new_terrain):
+            if __debug__ and game_logging.HOT_PATH_DEBUG:
+                log.debug("Tile %d não é válido para movimento", self.tile_number_of(new_terrain))
+            return False
+        return True
+
+    @timed("engine.move_player")
+    def move_player(self, direction):
+        """
+        Move o jogador da vez e encerra o turno se a movimentação for válida.
+
+        :param direction: "norte", "sul", "leste" ou "oeste".
+        :return: Tupla (papel, terreno antigo, terreno novo) ou None se o movimento for inválido.
+        :rtype: tuple
+        """
+        role = self.current_role()
+        current_terrain = self.player_positions[role]
+        if not self.is_move_valid(current_terrain, direction):
+            if __debug__ and game_logging.HOT_PATH_DEBUG:
+                log.debug("Jogador %s não pode se mover para %s a partir de %s.", role, direction, current_terrain)
+            return None
+        new_terrain = self.calculate_new_position(current_terrain, direction)
+        if __debug__ and game_logging.HOT_PATH_DEBUG:
+            log.debug("Jogador %s moveu-se de %s para %s.", role, current_terrain, new_terrain)
+        self.player_positions[role] = new_terrain
+        self.bits.move_to(self.player_roles.index(role), self.tile_number_of(new_terrain) - 1)
+        self.capture_treasure(new_terrain)
+        self.notify("action", direction)
+        self.notify("player_moved", role, current_terrain, new_terrain)
+        self.end_turn()  # Passa o turno somente se a movimentação for bem-sucedida
+        return role, current_terrain, new_terrain
+
+    def pass_turn(self):
+        """ O jogador da vez não se move e passa a vez. """
+        self.notify("action", "passar")
+        self.end_turn()
+
+    def end_turn(self):
+        """ Alaga a ilha, passa a vez e, a cada WATER_RISE_INTERVAL turnos, sobe a água. """
+        if self.is_won():
+            return  # Os jogadores escaparam; a ilha não afunda mais
+        self.draw_flood_cards()
+        self.next_turn()
+        if self.turn_count % WATER_RISE_INTERVAL == 0:
+            self.raise_water()
+
+    @timed("engine.next_turn")
+    def next_turn(self):
+        """ Atualiza o índice para o próximo jogador na ordem. """
+        previous_role = self.current_role()
+        self.current_turn_index = (self.current_turn_index + 1) % len(self.player_turn_order)
+        self.turn_count += 1
+        self.notify("turn", previous_role, self.current_role())
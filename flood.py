@@ -0,0 +1,80 @@
+"""
+Baralho de inundação do jogo 'Ilha Proibida'.
+"""
+import random
+
+# Cartas compradas por turno em cada nível da água (índice = nível - 1)
+WATER_LEVEL_DRAWS = (2, 2, 3, 3, 3, 4, 4, 5, 5)
+
+# Ao atingir este nível a ilha está perdida
+MAX_WATER_LEVEL = len(WATER_LEVEL_DRAWS) + 1
+
+# A água sobe a cada tantos turnos
+WATER_RISE_INTERVAL = 10
+
+
+class FloodDeck:
+    """
+    Baralho de inundação: uma pilha de compra e uma de descarte, ambas
+    listas com o topo no final, de modo que comprar e descartar são O(1).
+    Cartas de tiles afundados simplesmente não voltam ao descarte.
+
+    Com `seed`, cada reembaralhamento usa um gerador derivado da semente e
+    do número de reembaralhamentos já feitos, e não o ponto em que `rng`
+    está. Basta guardar esse número para que um baralho recriado com
+    from_piles continue exatamente como o original.
+
+    :param cards: Cartas iniciais (números dos tiles).
+    :type cards: iterable
+    :param rng: Gerador usado no embaralhamento inicial e, sem `seed`, nos reembaralhamentos.
+    :param seed: Semente da partida, opcional.
+    """
+    def __init__(self, cards, rng=random, seed=None):
+        self.rng = rng
+        self.seed = seed
+        self.reshuffles = 0
+        self.draw_pile = list(cards)
+        self.rng.shuffle(self.draw_pile)
+        self.discard_pile = []
+
+    @classmethod
+    def from_piles(cls, draw_pile, discard_pile, rng=random, seed=None, reshuffles=0):
+        """ Recria um baralho com as pilhas já na ordem dada, sem embaralhar. """
+        deck = cls.__new__(cls)
+        deck.rng = rng
+        deck.seed = seed
+        deck.reshuffles = reshuffles
+        deck.draw_pile = list(draw_pile)
+        deck.discard_pile = list(discard_pile)
+        return deck
+
+    def __len__(self):
+        return len(self.draw_pile)
+
+    def draw(self):
+        """
+        Compra a carta do topo; se a pilha de compra acabou, reembaralha o descarte.
+
+        :return: Número do tile ou None se não houver mais cartas.
+        :rtype: int
+        """
+        if not self.draw_pile:
+            self.reshuffle_discard()
+        if not self.draw_pile:
+            return None
+        return self.draw_pile.pop()
+
+    def discard(self, card):
+        """ Coloca a carta no topo do descarte. """
+        self.discard_pile.append(card)
+
+    def reshuffle_discard(self):
+        """
+        Embaralha o descarte e o coloca sobre a pilha de compra, como quando
+        a água sobe: os tiles já alagados voltam a ser comprados primeiro.
+        """
+        rng = self.rng if self.seed is None else random.Random(f"{self.seed}:{self.reshuffles}")
+        self.reshuffles += 1
+        rng.shuffle(self.discard_pile)
+        self.draw_pile.extend(self.discard_pile)
+        self.discard_pile.clear()
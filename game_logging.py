@@ -0,0 +1,77 @@
+"""
+Log do jogo 'Ilha Proibida', organizado por subsistema.
+
+Cada módulo usa get_logger("<subsistema>"), que devolve o logger
+"ilha.<subsistema>" (engine, board, simulator...). Sem configuração
+nada é impresso. configure_logging() liga a saída e define níveis
+globais ou por subsistema, por exemplo "INFO,engine=DEBUG".
+
+As mensagens do caminho de movimento ficam dentro de
+``if __debug__ and game_logging.HOT_PATH_DEBUG:``. Desligadas, custam
+apenas um teste de booleano; com ``python -O`` o bloco inteiro é
+removido pelo compilador.
+"""
+import logging
+import os
+
+ROOT_LOGGER_NAME = "ilha"
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Liga as mensagens de debug do caminho de movimento (teclas, validação)
+HOT_PATH_DEBUG = os.environ.get("ILHA_HOT_PATH_DEBUG") == "1"
+
+logging.getLogger(ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(subsystem):
+    """
+    Retorna o logger de um subsistema.
+
+    :param subsystem: Nome do subsistema, por exemplo "engine".
+    :type subsystem: str
+    :rtype: logging.Logger
+    """
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{subsystem}")
+
+def parse_levels(spec):
+    """
+    Interpreta uma especificação de níveis como "INFO,engine=DEBUG".
+
+    :param spec: Nível global e/ou pares subsistema=nível separados por vírgula.
+    :return: Tupla (nível global ou None, {subsistema: nível}).
+    :rtype: tuple
+    """
+    default_level = None
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        if "=" in item:
+            subsystem, level = item.split("=", 1)
+            levels[subsystem.strip()] = level.strip().upper()
+        else:
+            default_level = item.upper()
+    return default_level, levels
+
+def configure_logging(spec=None, stream=None, hot_path_debug=None):
+    """
+    Configura a saída de log. Sem `spec`, usa a variável de ambiente
+    ILHA_LOG (padrão "WARNING").
+
+    :param spec: Níveis no formato de parse_levels.
+    :param stream: Destino das mensagens; padrão é stderr.
+    :param hot_path_debug: Liga ou desliga as mensagens do caminho de movimento.
+    """
+    global HOT_PATH_DEBUG
+    default_level, levels = parse_levels(spec if spec is not None else os.environ.get("ILHA_LOG", "WARNING"))
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(root.handlers):
+        if not isinstance(handler, logging.NullHandler):
+            root.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(default_level or logging.WARNING)
+    for subsystem, level in levels.items():
+        get_logger(subsystem).setLevel(level)
+    if hot_path_debug is not None:
+        HOT_PATH_DEBUG = hot_path_debug
@@ -0,0 +1,72 @@
+"""
+Gerador da disposição da ilha para grids de qualquer tamanho.
+
+A ilha é o grid N x N sem um triângulo de mar em cada canto, com cateto
+N // 3; para N = 6 isso reproduz exatamente o tabuleiro clássico. Se a
+ilha tem mais tiles que os 24 terrenos clássicos, são criados terrenos
+numerados ("Recife 1", "Duna 1", ...); se tem menos, saem primeiro os
+terrenos que não são ponto de partida nem guardam tesouro.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+# Nomes-base dos terrenos extras dos tabuleiros grandes
+EXTRA_TERRAIN_BASES = ("Recife", "Duna", "Lagoa", "Rochedo", "Mangue", "Falésia")
+
+IslandLayout = namedtuple("IslandLayout", "grid_size black_tiles_numbers terrain_names")
+
+
+def sea_corner_size(grid_size):
+    """ Cateto do triângulo de mar em cada canto do grid. """
+    return grid_size // 3
+
+def is_sea(row, col, grid_size):
+    """ Indica se a célula fica fora da ilha. """
+    return min(row, grid_size - 1 - row) + min(col, grid_size - 1 - col) < sea_corner_size(grid_size)
+
+def extra_terrain_name(index):
+    """ Nome do terreno extra de número `index` (a partir de 0). """
+    return f"{EXTRA_TERRAIN_BASES[index % len(EXTRA_TERRAIN_BASES)]} {index // len(EXTRA_TERRAIN_BASES) + 1}"
+
+def extra_terrain_index(name):
+    """
+    Inverso de extra_terrain_name.
+
+    :raises ValueError: Se o nome não for de um terreno extra.
+    """
+    base, _, number = name.rpartition(" ")
+    if base not in EXTRA_TERRAIN_BASES or not number.isdigit():
+        raise ValueError(f"Terreno desconhecido: {name}")
+    return (int(number) - 1) * len(EXTRA_TERRAIN_BASES) + EXTRA_TERRAIN_BASES.index(base)
+
+@lru_cache(maxsize=None)
+def generate_layout(grid_size, base_names, required_names=()):
+    """
+    Gera a disposição de uma ilha N x N. O resultado depende só dos
+    argumentos e fica em cache.
+
+    :param grid_size: Tamanho do grid.
+    :param base_names: Terrenos clássicos, em ordem.
+    :param required_names: Terrenos que não podem faltar (pontos de partida, tesouros...).
+    :return: Disposição com tiles de mar e terrenos (ainda não embaralhados).
+    :rtype: IslandLayout
+    :raises ValueError: Se a ilha não comporta os terrenos obrigatórios.
+    """
+    black_tiles_numbers = frozenset(
+        row * grid_size + col + 1
+        for row in range(grid_size)
+        for col in range(grid_size)
+        if is_sea(row, col, grid_size)
+    )
+    playable = grid_size * grid_size - len(black_tiles_numbers)
+    if playable < len(required_names):
+        raise ValueError(f"Um grid {grid_size}x{grid_size} tem só {playable} tiles; "
+                         f"são necessários pelo menos {len(required_names)}")
+
+    if playable >= len(base_names):
+        terrain_names = tuple(base_names) + tuple(extra_terrain_name(index) for index in range(playable - len(base_names)))
+    else:
+        optional = [name for name in base_names if name not in required_names]
+        dropped = set(optional[playable - len(base_names):])
+        terrain_names = tuple(name for name in base_names if name not in dropped)
+    return IslandLayout(grid_size, black_tiles_numbers, terrain_names)
@@ -0,0 +1,202 @@
+"""
+Alcance e caminhos mínimos de cada papel, com cache por estado da ilha.
+
+GameState.move_player cobre apenas o passo ortogonal das setas; este
+módulo calcula o que cada papel alcança com N ações, considerando as
+habilidades especiais:
+
+- Explorador: também anda na diagonal;
+- Piloto: voa para qualquer tile não afundado com uma ação;
+- Mergulhador: atravessa tiles alagados ou afundados em uma única ação.
+
+Com role=None, o alcance segue a regra de GameState.move_player (um passo
+ortogonal para qualquer papel); é o que o bot (ai.evaluate) usa para medir
+a distância dos jogadores até os objetivos.
+"""
+from collections import deque
+
+DIAGONAL_OFFSETS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# Entradas do cache; ao passar disso o cache é esvaziado
+CACHE_SIZE = 4096
+
+
+class MovementService:
+    """
+    Calcula o alcance dos papéis por BFS sobre o tabuleiro atual. Os
+    resultados ficam em cache indexado pelos bitmasks dos tiles
+    (state.bits), então uma mudança de status nunca devolve um resultado
+    velho, e tabuleiros que se repetem, comuns na busca do bot, reaproveitam
+    o cálculo.
+
+    :param state: Estado do jogo observado.
+    :type state: GameState
+    """
+    def __init__(self, state):
+        self.state = state
+        self.cache = {}
+
+        # Vizinhanças pré-calculadas uma única vez
+        self.orthogonal = {terrain: tuple(neighbors.values()) for terrain, neighbors in state.neighbors.items()}
+        self.diagonal = {}
+        for terrain, (row, col) in state.terrain_cells.items():
+            self.diagonal[terrain] = self.orthogonal[terrain] + tuple(
+                state.cell_terrains[(row + d_row, col + d_col)]
+                for d_row, d_col in DIAGONAL_OFFSETS
+                if (row + d_row, col + d_col) in state.cell_terrains
+            )
+
+    def observe(self, state):
+        """
+        Passa a observar outro estado da mesma partida, como as cópias de
+        GameState.copy na busca do bot. As vizinhanças e o cache continuam
+        valendo, pois dependem só da disposição da ilha e dos tiles.
+        """
+        self.state = state
+
+    def board_key(self, role=None):
+        """
+        Chave do estado dos tiles usada no cache. Só o Mergulhador depende
+        dos tiles alagados; para os demais bastam os afundados.
+        """
+        bits = self.state.bits
+        if role == "Mergulhador":
+            return bits.sinking, bits.sunk
+        return bits.sunk
+
+    def cache_result(self, key, result):
+        if len(self.cache) >= CACHE_SIZE:
+            self.cache.clear()
+        self.cache[key] = result
+        return result
+
+    def is_walkable(self, terrain):
+        return not (self.state.bits.sunk >> (self.state.tile_number_of(terrain) - 1)) & 1
+
+    def is_flooded(self, terrain):
+        bits = self.state.bits
+        return bool(((bits.sinking | bits.sunk) >> (self.state.tile_number_of(terrain) - 1)) & 1)
+
+    def single_action_moves(self, role, terrain):
+        """
+        Terrenos que o papel alcança com uma ação a partir de `terrain`.
+
+        :param role: Papel do jogador; None para o passo ortogonal de GameState.move_player.
+        :param terrain: Terreno de partida.
+        :rtype: list
+        """
+        if role == "Piloto":
+            return [other for other in self.orthogonal if other != terrain and self.is_walkable(other)]
+        if role == "Explorador":
+            return [other for other in self.diagonal[terrain] if self.is_walkable(other)]
+        if role == "Mergulhador":
+            return self.dive(terrain)
+        return [other for other in self.orthogonal[terrain] if self.is_walkable(other)]
+
+    def dive(self, start):
+        """ Destinos do Mergulhador: vizinhos e tudo o que for alcançável nadando por tiles alagados ou afundados. """
+        destinations = []
+        visited = {start}
+        queue = deque([start])
+        while queue:
+            terrain = queue.popleft()
+            for neighbor in self.orthogonal[terrain]:
+                if neighbor in visited:
+                    continue
+                visited.add(neighbor)
+                if self.is_walkable(neighbor):
+                    destinations.append(neighbor)
+                if self.is_flooded(neighbor):
+                    queue.append(neighbor)  # Continua nadando a partir daqui
+        return destinations
+
+    def reachable(self, role, start, actions=1):
+        """
+        Terrenos que o papel alcança em até `actions` ações.
+
+        :param role: Papel do jogador.
+        :param start: Terreno de partida.
+        :param actions: Número máximo de ações.
+        :return: Dicionário {terreno: número mínimo de ações}, sem o terreno de partida.
+            O dicionário é compartilhado pelo cache e não deve ser modificado.
+        :rtype: dict
+        """
+        key = (self.board_key(role), "reachable", role, start, actions)
+        result = self.cache.get(key)
+        if result is None:
+            result = {}
+            frontier = [start]
+            seen = {start}
+            for step in range(1, actions + 1):
+                next_frontier = []
+                for terrain in frontier:
+                    for neighbor in self.single_action_moves(role, terrain):
+                        if neighbor not in seen:
+                            seen.add(neighbor)
+                            result[neighbor] = step
+                            next_frontier.append(neighbor)
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+            self.cache_result(key, result)
+        return result
+
+    def distances_to(self, goals, role=None):
+        """
+        Número mínimo de ações de cada terreno até o objetivo mais próximo,
+        por uma BFS a partir de todos os objetivos ao mesmo tempo. Os
+        movimentos de todos os papéis são simétricos, então a distância de
+        volta é a mesma da ida.
+
+        :param goals: Terrenos de destino.
+        :type goals: frozenset
+        :param role: Papel do jogador; None para o passo ortogonal de GameState.move_player.
+        :return: Dicionário {terreno: ações}; terrenos sem caminho ficam de fora.
+            O dicionário é compartilhado pelo cache e não deve ser modificado.
+        :rtype: dict
+        """
+        key = (self.board_key(role), "distances", role, goals)
+        result = self.cache.get(key)
+        if result is None:
+            result = {goal: 0 for goal in goals if self.is_walkable(goal)}
+            queue = deque(result)
+            while queue:
+                terrain = queue.popleft()
+                step = result[terrain] + 1
+                for neighbor in self.single_action_moves(role, terrain):
+                    if neighbor not in result:
+                        result[neighbor] = step
+                        queue.append(neighbor)
+            self.cache_result(key, result)
+        return result
+
+    def shortest_path(self, role, start, goal):
+        """
+        Caminho com menos ações entre dois terrenos.
+
+        :param role: Papel do jogador.
+        :param start: Terreno de partida.
+        :param goal: Terreno de destino.
+        :return: Lista de terrenos de `start` até `goal`, ou None se não houver caminho.
+        :rtype: list
+        """
+        key = (self.board_key(role), "path", role, start, goal)
+        if key in self.cache:
+            return self.cache[key]
+        parents = {start: None}
+        queue = deque([start])
+        path = None
+        while queue:
+            terrain = queue.popleft()
+            if terrain == goal:
+                path = []
+                while terrain is not None:
+                    path.append(terrain)
+                    terrain = parents[terrain]
+                path.reverse()
+                break
+            for neighbor in self.single_action_moves(role, terrain):
+                if neighbor not in parents:
+                    parents[neighbor] = terrain
+                    queue.append(neighbor)
+        return self.cache_result(key, path)
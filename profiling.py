@@ -0,0 +1,221 @@
+"""
+Cronômetros dos caminhos quentes do jogo 'Ilha Proibida'.
+
+As funções marcadas com @timed("nome") têm o tempo de cada chamada
+registrado em REGISTRY, de onde saem contagens, totais e percentis
+(p50/p95/p99). O cronômetro TURN_TIMER ("board.turn") mede cada turno
+inteiro, da tecla pressionada até o fim do render do frame em que o
+movimento foi aplicado; é o histograma a olhar quando a latência passa
+de um frame. A medição é ligada pela variável de ambiente ILHA_PROFILE,
+lida na importação:
+
+    ILHA_PROFILE=1 python run.py                 # só mede (API em processo)
+    ILHA_PROFILE=perfil.json python run.py       # grava JSON ao sair
+    ILHA_PROFILE=perfil.prof python run.py       # grava no formato do cProfile
+
+Desligada, @timed devolve a própria função: não há custo algum. O
+arquivo .prof abre com pstats ou snakeviz, como um perfil do cProfile,
+com uma entrada por cronômetro. A memória de cada cronômetro é limitada
+(RESERVOIR_SIZE), por mais longa que seja a sessão.
+"""
+import functools
+import os
+import random
+import time
+
+PROFILE_SPEC = os.environ.get("ILHA_PROFILE", "")
+
+# Os cronômetros só são instalados se a medição estiver ligada na importação
+ENABLED = PROFILE_SPEC not in ("", "0")
+
+PERCENTILES = (50, 95, 99)
+
+# Durações guardadas por cronômetro para os percentis; contagem, total e máximo são sempre exatos
+RESERVOIR_SIZE = 4096
+
+# Latência de um turno, da tecla ao render (registrada pelo tabuleiro em run.py)
+TURN_TIMER = "board.turn"
+
+
+def percentile(sorted_samples, percent):
+    """
+    Percentil pelo método do posto mais próximo.
+
+    :param sorted_samples: Amostras em ordem crescente.
+    :param percent: Percentil entre 0 e 100.
+    """
+    if not sorted_samples:
+        return 0
+    rank = max(1, -(-len(sorted_samples) * percent // 100))
+    return sorted_samples[rank - 1]
+
+
+class Reservoir:
+    """
+    Durações (em nanossegundos) de um cronômetro, com memória limitada.
+    Contagem, total e máximo são exatos; os percentis saem de uma amostra
+    uniforme de no máximo `size` durações (algoritmo R de Vitter).
+
+    :param size: Número máximo de durações guardadas.
+    :type size: int
+    """
+    __slots__ = ("size", "rng", "count", "total", "max", "samples")
+
+    def __init__(self, size=RESERVOIR_SIZE):
+        self.size = size
+        self.rng = random.Random(0)
+        self.clear()
+
+    def append(self, duration_ns):
+        self.count += 1
+        self.total += duration_ns
+        if duration_ns > self.max:
+            self.max = duration_ns
+        if len(self.samples) < self.size:
+            self.samples.append(duration_ns)
+        else:
+            index = self.rng.randrange(self.count)
+            if index < self.size:
+                self.samples[index] = duration_ns  # Cada duração fica com probabilidade size / count
+
+    def clear(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.samples = []
+
+
+class TimerRegistry:
+    """
+    Guarda as durações de cada cronômetro em um Reservoir.
+    """
+    def __init__(self):
+        self.samples = {}  # Nome -> Reservoir
+        self.functions = {}  # Nome -> função medida, para o formato do cProfile
+
+    def samples_for(self, name, func=None):
+        """ Reservoir do cronômetro, criado na primeira vez. """
+        if func is not None:
+            self.functions.setdefault(name, func)
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = Reservoir()
+        return samples
+
+    def record(self, name, duration_ns):
+        self.samples_for(name).append(duration_ns)
+
+    def reset(self):
+        """ Descarta as amostras, mantendo os reservoirs já ligados aos cronômetros. """
+        for samples in self.samples.values():
+            samples.clear()
+
+    def stats(self):
+        """
+        Resumo de cada cronômetro em microssegundos.
+
+        :return: Dicionário {nome: {"calls", "total_us", "mean_us", "p50_us", "p95_us", "p99_us", "max_us"}}.
+        :rtype: dict
+        """
+        result = {}
+        for name, samples in self.samples.items():
+            if not samples.count:
+                continue
+            ordered = sorted(samples.samples)
+            summary = {
+                "calls": samples.count,
+                "total_us": samples.total / 1000,
+                "mean_us": samples.total / samples.count / 1000
+            }
+            for percent in PERCENTILES:
+                summary[f"p{percent}_us"] = percentile(ordered, percent) / 1000
+            summary["max_us"] = samples.max / 1000
+            result[name] = summary
+        return result
+
+    def dump_json(self, path):
+        import json
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(self.stats(), output, indent=2)
+
+    def dump_pstats(self, path):
+        """
+        Grava as medidas no formato de pstats (o mesmo de cProfile.dump_stats).
+        O tempo próprio e o acumulado são iguais: os cronômetros não
+        sabem quem chamou quem.
+        """
+        import marshal
+        entries = {}
+        for name, samples in self.samples.items():
+            if not samples.count:
+                continue
+            func = self.functions.get(name)
+            if func is not None:
+                code = func.__code__
+                key = (code.co_filename, code.co_firstlineno, name)
+            else:
+                key = ("~", 0, name)
+            seconds = samples.total / 1e9
+            entries[key] = (samples.count, samples.count, seconds, seconds, {})
+        with open(path, "wb") as output:
+            marshal.dump(entries, output)
+
+    def dump(self, path):
+        """ Grava em JSON se o caminho terminar em .json; senão, no formato do cProfile. """
+        if path.endswith(".json"):
+            self.dump_json(path)
+        else:
+            self.dump_pstats(path)
+
+    def timer(self, name):
+        """ Gerenciador de contexto que mede um bloco qualquer. """
+        return BlockTimer(self.samples_for(name))
+
+class BlockTimer:
+    def __init__(self, samples):
+        self.samples = samples
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.samples.append(time.perf_counter_ns() - self.start)
+        return False
+
+REGISTRY = TimerRegistry()
+
+
+def timed(name):
+    """
+    Decorator que registra a duração de cada chamada em REGISTRY.
+
+    :param name: Nome do cronômetro, por exemplo "engine.move_player".
+    :type name: str
+    :return: Decorator; sem ILHA_PROFILE, devolve a função sem alterações.
+    :rtype: function
+    """
+    def decorator(func):
+        if not ENABLED:
+            return func
+        append = REGISTRY.samples_for(name, func).append
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                append(clock() - start)
+        return wrapper
+    return decorator
+
+def dump_at_exit():
+    if PROFILE_SPEC not in ("", "0", "1"):
+        REGISTRY.dump(PROFILE_SPEC)
+
+if ENABLED:
+    import atexit
+    atexit.register(dump_at_exit)
@@ -0,0 +1,130 @@
+"""
+Registro e reprodução de partidas.
+
+Como todo sorteio de uma partida sai de random.Random(semente), basta
+guardar a semente e as ações dos jogadores para reconstruir qualquer
+estado. O registro é um arquivo de texto só de acréscimo, com uma ou
+mais partidas:
+
+    # {"seed": 42, "num_players": 4, "grid_size": 6}
+    N
+    L
+    P
+
+A linha iniciada por "#" abre uma partida; cada linha seguinte é uma
+ação: N(orte), S(ul), L(este), O(este) ou P(assar).
+
+Uso: python replay.py partidas.log --game 3 --stop 120
+"""
+import argparse
+import json
+
+from engine import GameState
+
+ACTION_CODES = {
+    "norte": "N",
+    "sul": "S",
+    "leste": "L",
+    "oeste": "O",
+    "passar": "P"
+}
+
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+
+class GameRecorder:
+    """
+    Grava as ações de uma partida em um stream de texto.
+
+    :param stream: Arquivo aberto para escrita (de preferência em modo "a").
+    """
+    def __init__(self, stream):
+        self.stream = stream
+
+    def attach(self, state):
+        """ Escreve o cabeçalho da partida e passa a registrar suas ações. """
+        header = {"seed": state.seed, "num_players": state.num_players, "grid_size": state.grid_size}
+        self.stream.write("# " + json.dumps(header) + "\n")
+        state.listeners.append(self.on_state_change)
+
+    def on_state_change(self, event, *args):
+        if event == "action":
+            self.stream.write(ACTION_CODES[args[0]] + "\n")
+
+
+def read_games(stream):
+    """
+    Lê as partidas de um registro.
+
+    :param stream: Arquivo aberto para leitura.
+    :return: Gerador de tuplas (cabeçalho, lista de ações).
+    """
+    header = None
+    actions = []
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            if header is not None:
+                yield header, actions
+            header = json.loads(line[1:])
+            actions = []
+        else:
+            actions.append(CODE_ACTIONS[line])
+    if header is not None:
+        yield header, actions
+
+def replay(header, actions, stop=None):
+    """
+    Reconstrói o estado da partida aplicando as ações a partir da semente.
+
+    :param header: Cabeçalho da partida (semente, jogadores, grid).
+    :param actions: Ações na ordem em que foram feitas.
+    :param stop: Número de ações a aplicar; padrão é todas.
+    :return: Estado após as ações.
+    :rtype: GameState
+    """
+    state = GameState(header["num_players"], header["grid_size"], seed=header["seed"])
+    for action in actions[:stop]:
+        if action == "passar":
+            state.pass_turn()
+        elif state.move_player(action) is None:
+            raise ValueError(f"Ação inválida no registro: {action} no turno {state.turn_count}")
+    return state
+
+def replay_file(path, game_index=0, stop=None):
+    """
+    Reconstrói uma partida gravada em arquivo.
+
+    :param path: Caminho do registro.
+    :param game_index: Índice da partida no arquivo.
+    :param stop: Número de ações a aplicar; padrão é todas.
+    :rtype: GameState
+    """
+    with open(path, encoding="utf-8") as stream:
+        for index, (header, actions) in enumerate(read_games(stream)):
+            if index == game_index:
+                return replay(header, actions, stop)
+    raise IndexError(f"O registro {path} não tem a partida {game_index}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz uma partida gravada da Ilha Proibida")
+    parser.add_argument("path", help="arquivo de registro")
+    parser.add_argument("--game", type=int, default=0, help="índice da partida no arquivo")
+    parser.add_argument("--stop", type=int, default=None, help="número de ações a aplicar")
+    args = parser.parse_args(argv)
+
+    state = replay_file(args.path, args.game, args.stop)
+    print(f"Semente: {state.seed}")
+    print(f"Turno: {state.turn_count}, nível da água: {state.water_level}")
+    print(f"Vez de: {state.current_role()}")
+    for role, terrain in state.player_positions.items():
+        print(f"  {role}: {terrain}")
+    print(f"Tesouros capturados: {', '.join(sorted(state.captured_treasures)) or 'nenhum'}")
+    print(f"Terrenos afundados: {', '.join(state.sink_order) or 'nenhum'}")
+    print("Resultado: " + ("vitória" if state.is_won() else "derrota" if state.is_lost() else "em andamento"))
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,56 @@
-import tkinter as tk
-from tkinter import simpledialog  # Importação adicional
-import random
+"""
+Tabuleiro gráfico do jogo 'Ilha Proibida'.
+
+Importar este módulo não abre janelas nem carrega o tkinter: o tkinter
+só é importado quando o primeiro tabuleiro é criado (load_tk). Para
+jogar, use main(), por exemplo com ``python -m run``.
+"""
+import concurrent.futures
+import time
+from collections import deque
+
+import game_logging
+from constants import PLAYER_COLORS, TREASURE_COLORS, TREASURE_TERRAINS
+from engine import GameState
+from profiling import ENABLED as PROFILING, REGISTRY, TURN_TIMER, timed
+from sprites import SPRITES_AVAILABLE, SpriteCache
+
+log = game_logging.get_logger("board")
+
+# Módulo tkinter, carregado por load_tk() na primeira janela
+tk = None
+
+# Arquivo onde Ctrl+S grava o snapshot da partida
+SAVE_PATH = "ilha_proibida.sav"
+
+# Lado máximo do grid na tela; em tabuleiros grandes os tiles encolhem para caber
+MAX_BOARD_PIXELS = 880
+
+# Intervalo entre frames, em milissegundos; a fila de entrada é esvaziada uma vez por frame
+FRAME_MS = 16
+
+# Teclas guardadas entre dois frames; com a tecla presa, as mais antigas são descartadas
+MAX_PENDING_MOVES = 4
+
+# Passo e limite do zoom com Ctrl+mais e Ctrl+menos
+ZOOM_STEP = 10
+MIN_TILE_SIZE = 20
+
+def load_tk():
+    """
+    Importa o tkinter na primeira vez em que é necessário.
+
+    :return: Módulo tkinter (ou o substituto já atribuído a `tk`).
+    """
+    global tk
+    if tk is None:
+        import tkinter
+        tk = tkinter
+    return tk
 
 def logging_decorator(func):
     """
-    Decorator para registrar o início e o fim da execução de uma função.
+    Decorator para registrar no log o início e o fim da execução de uma função.
 
     :param func: Função a ser decorada.
     :type func: function
@@ -12,38 +58,12 @@ def logging_decorator(func):
     :rtype: function
     """
     def wrapper(*args, **kwargs):
-        print(f"Executing {func.__name__}...")
+        log.debug("Executing %s...", func.__name__)
         result = func(*args, **kwargs)
-        print(f"Done executing {func.__name__}.")
+        log.debug("Done executing %s.", func.__name__)
         return result
     return wrapper
 
-# Decorator para atribuição de nomes aos terrenos
-def assign_names_decorator(func):
-    """
-    Decorator para inicializar e embaralhar os nomes dos terrenos.
-
-    :param func: Função a ser decorada.
-    :type func: function
-    :return: Função decorada com inicialização de nomes dos terrenos.
-    :rtype: function
-    """
-    def wrapper(self, *args, **kwargs):
-        self.terrain_names = [
-            "Jardim Sussurrante", "Jardim Uivante", "Caverna das Sombras", 
-            "Caverna das Chamas", "Palácio de Coral", "Palácio das Marés", 
-            "Templo da Lua", "Templo do Sol", "Rocha Fantasma", 
-            "Floresta Carmesim", "Clareira do Crepúsculo", "Torre de Vigia",
-            "Pântano de Pavor", "Portal de Prata", "Portal de Bronze", 
-            "Portal de Ferro", "Portal de Ouro", "Portal de Cobre",
-            "Observatório", "Heliponto", "Caverna do Vórtice", "Templo do Vento",
-            "Templo do Fogo", "Caverna da Onda"
-        ]
-
-        random.shuffle(self.terrain_names)
-        return func(self, *args, **kwargs)
-    return wrapper
-
 # Decorator para status do terreno
 def tile_status_decorator(func):
     """
@@ -56,33 +76,15 @@ def tile_status_decorator(func):
     """
     def wrapper(self, row, col, terrain_index, *args, **kwargs):
         tile_number = row * self.grid_size + col + 1
-        status = "Normal"
-        if self.sunk_tile_number and tile_number == self.sunk_tile_number:
-            status = "Afundado"
-        elif self.sinking_tiles and tile_number in self.sinking_tiles:
-            status = "Afundando"
+        status = self.state.tile_status(tile_number)
         return func(self, row, col, terrain_index, status, *args, **kwargs)
     return wrapper
 
-# Decorator para tesouros nas diagonais
-def treasure_decorator(func):
-    """
-    Decorator para criar e embaralhar os nomes dos tesouros.
-
-    :param func: Função a ser decorada.
-    :type func: function
-    :return: Função decorada com inicialização de nomes dos tesouros.
-    :rtype: function
-    """
-    def wrapper(self, *args, **kwargs):
-        self.treasure_names = ["Cálice da Maré", "Cristal de Fogo", "Estátua de Pedra", "Orbe Terrestre"]
-        random.shuffle(self.treasure_names)
-        return func(self, *args, **kwargs)
-    return wrapper
-
 class ForbiddenIslandBoard:
     """
-    Representa o tabuleiro do jogo 'Ilha Proibida'.
+    Representa o tabuleiro do jogo 'Ilha Proibida'. As regras ficam em
+    GameState; esta classe apenas desenha o estado no canvas e repassa
+    as teclas pressionadas.
 
     :param root: Instância do tkinter.
     :type root: Tk
@@ -90,239 +92,294 @@ class ForbiddenIslandBoard:
     :type grid_size: int
     :param tile_size: Tamanho visual de cada tile.
     :type tile_size: int
+    :param state: Estado do jogo; se omitido, um novo jogo é criado.
+    :type state: GameState
+    :param client: Conexão com uma mesa do servidor; o tabuleiro desenha a
+        cópia local da mesa e envia as teclas ao servidor.
+    :type client: GameClient
+    :param use_sprites: Desenha os tiles como imagens pré-renderizadas; padrão é
+        usar se o Pillow estiver instalado.
+    :type use_sprites: bool
+    :param bot: Jogador artificial dos papéis em `bot_roles`.
+    :type bot: MCTSPlayer
+    :param bot_roles: Papéis jogados pelo bot.
+    :type bot_roles: iterable
     """
-    def __init__(self, root, grid_size=6, tile_size=110):
+    def __init__(self, root, grid_size=6, tile_size=110, state=None, client=None, use_sprites=None, bot=None,
+                 bot_roles=()):
         """
         Inicializador da classe ForbiddenIslandBoard.
 
         :param root: Instância do Tk.
         :param grid_size: Tamanho do grid, padrão é 6.
         :param tile_size: Tamanho de cada tile, padrão é 110.
+        :param state: Estado do jogo já existente, opcional.
+        :param client: GameClient já dentro de uma mesa, opcional.
+        :param use_sprites: Usa o cache de imagens dos tiles; padrão é SPRITES_AVAILABLE.
+        :param bot: Bot que joga pelos papéis em `bot_roles`, opcional.
+        :param bot_roles: Papéis controlados pelo bot.
         """
         self.root = root
+        self.client = client
+        self.bot = bot
+        self.bot_roles = set(bot_roles)
+        # O bot pensa em outra thread sobre uma cópia do estado, sem travar a janela
+        self.bot_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if bot is not None else None
+        self.bot_future = None  # Busca em andamento
+        self.bot_turn_count = None  # turn_count do estado quando a busca começou
+        if client is not None:
+            state = client.state
+        if state is not None:
+            grid_size = state.grid_size
         self.grid_size = grid_size
-        self.tile_size = tile_size
-        self.canvas_width = grid_size * tile_size + 15 # Adiciona 1 ou mais pixels
-        self.canvas_height = grid_size * tile_size + 50
-        self.canvas = tk.Canvas(root, width=self.canvas_width, height=self.canvas_height)
+        self.tile_size = min(tile_size, MAX_BOARD_PIXELS // grid_size)
+        self.canvas_width = grid_size * self.tile_size + 15 # Adiciona 1 ou mais pixels
+        self.canvas_height = grid_size * self.tile_size + 50
+        self.canvas = load_tk().Canvas(root, width=self.canvas_width, height=self.canvas_height)
         self.canvas.pack()
-        self.black_tiles_numbers = {1, 2, 5, 6, 7, 12, 25, 30, 31, 32, 35, 36}
-        self.initialize_terrain_names()
         self.assign_player_roles()
-        self.initialize_treasures()
         self.terrain_positions = {}
-        # Inicialmente, não há terrenos com status especial
-        self.sunk_tile_number = None
-        self.sinking_tiles = set()
-        self.terrain_treasure_mapping = {
-            "Jardim Sussurrante": "Cálice da Maré",
-            "Jardim Uivante": "Cálice da Maré",
-            "Caverna das Sombras": "Estátua de Pedra",
-            "Caverna das Chamas": "Estátua de Pedra",
-            "Palácio de Coral": "Cristal de Fogo",
-            "Palácio das Marés": "Cristal de Fogo",
-            "Templo da Lua": "Orbe Terrestre",
-            "Templo do Sol": "Orbe Terrestre"
-            }
-        self.treasure_colors = {
-            "Cálice da Maré": "#800080",  # Exemplo de cor em hexadecimal
-            "Cristal de Fogo": "#FF8C00",
-            "Estátua de Pedra": "#8B4513",
-            "Orbe Terrestre": "#006400"
-            }
-        self.num_players = self.ask_number_of_players()  # Pergunta o número de jogadores
-        self.assign_roles_randomly()  # Atribui os papéis aleatoriamente
-        self.player_positions = {}  # Dicionário para manter as posições dos jogadores
-        self.set_initial_positions()
-
-        self.player_turn_order = random.sample(self.player_roles, len(self.player_roles))
-        self.current_turn_index = 0
+        self.treasure_colors = dict(TREASURE_COLORS)
+        if state is None:
+            state = GameState(self.ask_number_of_players(), grid_size)  # Pergunta o número de jogadores
+        self.state = state
 
         self.setup_key_bindings()
 
-        print(f"Ordem dos turnos dos jogadores: {self.player_turn_order}")
-        print(f"É a vez do jogador: {self.player_turn_order[self.current_turn_index]}")
-
         # Inicializa o label para mostrar as coordenadas
         self.coordinates_label = tk.Label(root, text="")
         self.coordinates_label.pack()
         # Vincula o evento de movimento do mouse ao canvas
         self.canvas.bind("<Motion>", self.on_mouse_move)
 
+        # IDs dos itens do canvas, criados uma vez e reaproveitados a cada frame
         self.player_rectangles = {}
-    
+        self.tile_items = {}  # Nome do terreno -> (retângulo, nome, status) ou (imagem,) com sprites
+        if use_sprites is None:
+            use_sprites = SPRITES_AVAILABLE
+        self.sprites = SpriteCache(self.tile_size) if use_sprites else None
+        self.terrain_indexes = {}  # Nome do terreno -> índice em state.terrain_names
+        self.treasure_items = {}  # Nome do terreno -> marcador do tesouro guardado nele
+        self.dirty_tiles = set()
+        self.canvas_item_count = 0  # Itens criados por track_item; o tabuleiro nunca apaga itens
+
+        # Fila de entrada, processada em process_frame: (direção, momento da tecla em perf_counter_ns)
+        self.pending_moves = deque(maxlen=MAX_PENDING_MOVES)
+        self.pending_pointer = None  # Só a última posição do mouse interessa
+        self.frame_id = None
+
+        # O estado avisa quais tiles e jogadores mudaram; só eles são redesenhados
+        self.state.listeners.append(self.on_state_change)
+        if self.client is not None or self.bot is not None:
+            self.schedule_frame()
+
     def on_mouse_move(self, event):
-        # Atualiza o label com a posição atual do mouse
-        self.coordinates_label.config(text=f"X: {event.x}, Y: {event.y}")
+        # Guarda a posição; o label é atualizado uma vez por frame
+        self.pending_pointer = (event.x, event.y)
+        self.schedule_frame()
 
     def setup_key_bindings(self):
-        print("Setting up key bindings")
-        self.root.bind("<Left>", lambda e: self.move_player("oeste"))
-        self.root.bind("<Right>", lambda e: self.move_player("leste"))
-        self.root.bind("<Up>", lambda e: self.move_player("norte"))
-        self.root.bind("<Down>", lambda e: self.move_player("sul"))
-
-    def is_move_valid(self, current_position, direction):
-        x, y = self.get_tile_position(current_position)
-        grid_x, grid_y = int(x / self.tile_size), int(y / self.tile_size)
-        print(f"Posição atual: ({grid_x}, {grid_y}), Direção: {direction}")
-
-        new_grid_x, new_grid_y = grid_x, grid_y
-
-        if direction == "norte" and grid_y > 0:
-            new_grid_y -= 1
-        elif direction == "sul" and grid_y < self.grid_size - 1:
-            new_grid_y += 1
-        elif direction == "leste" and grid_x < self.grid_size - 1:
-            new_grid_x += 1
-        elif direction == "oeste" and grid_x > 0:
-            new_grid_x -= 1
-
-        for terrain, pos in self.terrain_positions.items():
-            pos_x, pos_y = pos
-            pos_grid_x, pos_grid_y = int(pos_x / self.tile_size), int(pos_y / self.tile_size)
-            if pos_grid_x == new_grid_x and pos_grid_y == new_grid_y:
-                print(f"Nova posição encontrada no terreno: {terrain}")
-                tile_number = new_grid_y * self.grid_size + new_grid_x + 1
-                if self.sunk_tile_number == tile_number or tile_number in self.sinking_tiles:
-                    print(f"Tile {tile_number} não é válido para movimento")
-                    return False
-                return True
-        print(f"Nenhuma correspondência de terreno encontrada para a nova posição")
-        return False
-    
+        log.debug("Setting up key bindings")
+        self.root.bind("<Left>", lambda e: self.queue_move("oeste"))
+        self.root.bind("<Right>", lambda e: self.queue_move("leste"))
+        self.root.bind("<Up>", lambda e: self.queue_move("norte"))
+        self.root.bind("<Down>", lambda e: self.queue_move("sul"))
+        self.root.bind("<Control-s>", lambda e: self.save_snapshot(SAVE_PATH))
+        self.root.bind("<Control-plus>", lambda e: self.set_tile_size(self.tile_size + ZOOM_STEP))
+        self.root.bind("<Control-equal>", lambda e: self.set_tile_size(self.tile_size + ZOOM_STEP))
+        self.root.bind("<Control-minus>", lambda e: self.set_tile_size(max(MIN_TILE_SIZE, self.tile_size - ZOOM_STEP)))
+
+    def set_tile_size(self, tile_size):
+        """
+        Muda o zoom do tabuleiro. Só aqui as imagens dos tiles são refeitas;
+        os itens do canvas são reposicionados, não recriados.
+
+        :param tile_size: Novo lado dos tiles, em pixels.
+        """
+        if tile_size == self.tile_size:
+            return
+        self.tile_size = tile_size
+        if self.sprites is not None:
+            self.sprites.resize(tile_size)
+        self.canvas_width = self.grid_size * tile_size + 15
+        self.canvas_height = self.grid_size * tile_size + 50
+        self.canvas.config(width=self.canvas_width, height=self.canvas_height)
+        for terrain_name in self.tile_items:
+            self.redraw_tile(terrain_name)
+        self.place_treasures()
+        current_role = self.state.current_role()
+        for role in self.player_rectangles:
+            self.update_player_rectangle(role, add_highlight=role == current_role)
+
+    def save_snapshot(self, path):
+        """ Grava o estado da partida; retome com `python run.py <arquivo>`. """
+        with open(path, "wb") as snapshot:
+            snapshot.write(self.state.to_bytes())
+        log.info("Partida salva em %s", path)
+
+    def queue_move(self, direction):
+        """ Enfileira a tecla pressionada; o movimento é aplicado no próximo frame. """
+        self.pending_moves.append((direction, time.perf_counter_ns()))
+        self.schedule_frame()
+
+    def schedule_frame(self):
+        """ Agenda process_frame, se ainda não houver um frame agendado. """
+        if self.frame_id is None:
+            self.frame_id = self.root.after(FRAME_MS, self.process_frame)
+
+    @timed("board.process_frame")
+    def process_frame(self):
+        """
+        Esvazia a fila de entrada: aplica os movimentos em lote, atualiza
+        o label do mouse com a última posição e redesenha uma única vez.
+        Com a medição ligada, registra em TURN_TIMER o tempo de cada turno
+        jogado, da tecla até o fim do render.
+        """
+        self.frame_id = None
+        if self.client is not None:
+            self.client.poll()  # Diferenças recebidas do servidor
+        played = []  # Momentos das teclas que viraram turnos neste frame
+        while self.pending_moves:
+            direction, pressed_at = self.pending_moves.popleft()
+            if self.is_bot_turn():
+                continue  # A vez é do bot; a tecla é descartada
+            if self.apply_move(direction):
+                played.append(pressed_at)
+        bot_turn = self.play_bot_turn()
+        if self.pending_pointer is not None:
+            x, y = self.pending_pointer
+            self.pending_pointer = None
+            self.coordinates_label.config(text=f"X: {x}, Y: {y}")
+        self.finish_frame()
+        if PROFILING and played:
+            rendered_at = time.perf_counter_ns()
+            for pressed_at in played:
+                REGISTRY.record(TURN_TIMER, rendered_at - pressed_at)
+        if self.client is not None or bot_turn:
+            self.schedule_frame()  # O servidor ou o bot ainda vão mudar o estado
+
+    def apply_move(self, direction):
+        """
+        Aplica o movimento ao estado (ou envia ao servidor) sem redesenhar o canvas.
+
+        :return: True se o turno foi jogado localmente; movimentos enviados ao servidor retornam False.
+        :rtype: bool
+        """
+        if self.state.is_over():
+            return False
+        if self.client is not None:
+            self.client.send_move(direction)
+            return False
+        return self.state.apply_action(direction)
+
+    def is_bot_turn(self):
+        """ True se a partida continua e a vez é de um papel do bot. """
+        return self.bot is not None and not self.state.is_over() and self.state.current_role() in self.bot_roles
+
+    def play_bot_turn(self):
+        """
+        Cuida da vez do bot sem bloquear a janela: inicia a busca em outra
+        thread e, num frame seguinte, aplica a ação escolhida se o estado
+        não mudou enquanto o bot pensava.
+
+        :return: True se o bot está pensando ou tem a vez (e o próximo frame deve olhar de novo).
+        :rtype: bool
+        """
+        if self.bot_future is not None:
+            if not self.bot_future.done():
+                return True  # O bot ainda está pensando
+            future, turn_count = self.bot_future, self.bot_turn_count
+            self.bot_future = self.bot_turn_count = None
+            action = future.result()
+            if action is not None and self.state.turn_count == turn_count and self.is_bot_turn():
+                self.apply_move(action)
+            return True
+        if not self.is_bot_turn():
+            return False
+        if self.client is not None and self.client.pending_moves:
+            return True  # Espera o servidor responder à jogada anterior
+        self.bot_turn_count = self.state.turn_count
+        self.bot_future = self.bot_executor.submit(self.bot.choose, self.state.copy())
+        return True
+
+    def finish_frame(self):
+        self.render()
+        if self.state.is_over():
+            self.root.title("Ilha Proibida - " + ("Vitória!" if self.state.is_won() else "A ilha afundou"))
+
+    @timed("board.move_player")
     def move_player(self, direction):
-        role = self.player_turn_order[self.current_turn_index]
-        current_terrain = self.player_positions[role]
-
-        new_terrain = self.calculate_new_position(current_terrain, direction)
-        if new_terrain and new_terrain != current_terrain:
-            print(f"Jogador {role} moveu-se de {current_terrain} para {new_terrain}.")
-            self.update_player_position(role, new_terrain)
-            self.end_player_turn()  # Move para o próximo turno somente se a movimentação for bem-sucedida
-        else:
-            print(f"Jogador {role} não pode se mover para {direction} a partir de {current_terrain}.")        
-
-    def calculate_new_position(self, current_terrain, direction):
-        x, y = self.get_tile_position(current_terrain)
-        grid_x, grid_y = int(x / self.tile_size), int(y / self.tile_size)
-        print(f"Calculando nova posição a partir de ({grid_x}, {grid_y}) na direção {direction}")
-
-        if direction == "norte":
-            grid_y -= 1
-        elif direction == "sul":
-            grid_y += 1
-        elif direction == "leste":
-            grid_x += 1
-        elif direction == "oeste":
-            grid_x -= 1
-
-        for terrain, pos in self.terrain_positions.items():
-            pos_x, pos_y = pos
-            pos_grid_x, pos_grid_y = int(pos_x / self.tile_size), int(pos_y / self.tile_size)
-            if pos_grid_x == grid_x and pos_grid_y == grid_y:
-                print(f"Nova posição encontrada no terreno: {terrain}")
-                return terrain
-        print("Nova posição não encontrada")
-        return None
-
-    def update_player_position(self, role, new_position):
-        x_old, y_old = self.get_tile_position(self.player_positions[role])
-        x_new, y_new = self.get_tile_position(new_position)
-
-        if (x_old, y_old) != (x_new, y_new):
-            old_rect = self.player_rectangles.get(role)
-            if old_rect:
-                self.canvas.delete(old_rect)  # Apaga o retângulo antigo
-                self.redraw_tile_at(x_old, y_old)  # Redesenhar o tile antigo
-
-            new_rect = self.draw_player_square(x_new, y_new, self.tile_size, role, highlight=True, highlight_color=self.player_piece_colors[role])
-            self.player_positions[role] = new_position
-            self.player_rectangles[role] = new_rect
-        
-    def end_player_turn(self):
-        # Remover highlight do jogador atual
-        self.highlight_current_player(remove=True)
-        # Proceder para o próximo turno
-        self.next_turn()
-        
-    def next_turn(self):
-        # Atualiza o índice para o próximo jogador na ordem
-        self.current_turn_index = (self.current_turn_index + 1) % len(self.player_turn_order)
-        # Aplicar highlight ao próximo jogador
-        self.highlight_current_player()
+        """ Aplica um movimento e redesenha na hora, sem passar pela fila. """
+        self.apply_move(direction)
+        self.finish_frame()
+
+    def on_state_change(self, event, *args):
+        """ Recebe as mudanças do GameState e agenda apenas o que precisa ser redesenhado. """
+        if event == "tile_status":
+            tile_number, _status = args
+            self.mark_tile_dirty(self.state.cell_terrains[divmod(tile_number - 1, self.grid_size)])
+        elif event == "player_moved":
+            self.update_player_position(*args)
+        elif event == "turn" and self.player_rectangles:
+            self.end_player_turn(args[0])  # Atualiza o highlight para o jogador da vez
+
+    @timed("board.update_player_position")
+    def update_player_position(self, role, old_position, new_position):
+        if old_position != new_position and role in self.player_rectangles:
+            x_new, y_new = self.get_tile_position(new_position)
+            # Apenas move o retângulo já existente; o tile antigo não precisa ser redesenhado
+            self.canvas.coords(self.player_rectangles[role], *self.player_square_coords(x_new, y_new, self.tile_size, role))
 
     def update_player_rectangle(self, role, add_highlight):
-        x, y = self.get_tile_position(self.player_positions[role])
-        old_rect = self.player_rectangles.get(role)
-        if old_rect:
-            self.canvas.delete(old_rect)
+        x, y = self.get_tile_position(self.state.player_positions[role])
         highlight_color = "#800080" if add_highlight else self.player_piece_colors[role]
-        new_rect = self.draw_player_square(x, y, self.tile_size, role, highlight=add_highlight, highlight_color=highlight_color)
-        self.player_rectangles[role] = new_rect
-
-    def highlight_current_player(self, remove=False):
-        role = self.player_turn_order[self.current_turn_index]
-        current_terrain = self.player_positions[role]
-        self.update_player_rectangle(role, add_highlight=True)
-    
-    def end_player_turn(self):
-        current_role = self.player_turn_order[self.current_turn_index]
-        self.update_player_rectangle(current_role, add_highlight=False)
-        self.next_turn()
-
-    def redraw_tile_at(self, x, y):
-        # Calcular a posição do grid com base em x e y
-        grid_x = int(x / self.tile_size)
-        grid_y = int(y / self.tile_size)
-
-        # Encontrar o nome do terreno e o índice correspondente
-        terrain_name = None
-        for name, pos in self.terrain_positions.items():
-            if pos == (x, y):
-                terrain_name = name
-                break
-
-        # Se o terreno foi encontrado, redesenhe-o
-        if terrain_name:
-            # Encontrar o índice do terreno na lista de terrenos
-            terrain_index = self.terrain_names.index(terrain_name)
-            # Chame draw_tile com o índice correto
-            self.draw_tile(grid_y, grid_x, terrain_index)
-
-            # Definir a cor do texto com base no terreno
-            font_color = 'black' if terrain_name not in self.player_piece_colors else self.player_piece_colors[terrain_name]
-            font_style = ('Helvetica', 6)
-            self.canvas.create_text(x, y - 15, text=terrain_name, fill=font_color, font=font_style)
-        else:
-            print("Erro: terreno não encontrado para redesenhar.")
-
-
-    def set_initial_positions(self):
-        """ Define as posições iniciais dos jogadores com base em seus papéis. """
-        role_starting_points = {
-            "Piloto": "Heliponto",
-            "Engenheiro": "Portal de Bronze",
-            "Explorador": "Portal de Cobre",
-            "Mergulhador": "Portal de Ferro",
-            "Mensageiro": "Portal de Prata",
-            "Navegador": "Portal de Ouro"
-        }
-        for role in self.player_roles:
-            starting_point = role_starting_points[role]
-            self.player_positions[role] = starting_point  # Define a posição inicial para cada papel
-            print(f"{role} começa em {starting_point}")  # Adicione esta linha para debugar
-    
-    def draw_player_square(self, x, y, tile_size, role, highlight=False, highlight_color=None):
-        player_index = self.player_roles.index(role)
-        player_color = self.player_piece_colors[role]
+        player_rect = self.player_rectangles[role]
+        self.canvas.coords(player_rect, *self.player_square_coords(x, y, self.tile_size, role))
+        self.canvas.itemconfig(player_rect, outline=highlight_color, width=3 if add_highlight else 0)
+
+    def highlight_current_player(self):
+        self.update_player_rectangle(self.state.current_role(), add_highlight=True)
+
+    def end_player_turn(self, previous_role):
+        # Remover highlight do jogador anterior e aplicar ao próximo
+        self.update_player_rectangle(previous_role, add_highlight=False)
+        self.highlight_current_player()
+
+    def redraw_tile(self, terrain_name):
+        # Posição no grid vem do índice do estado, sem converter pixels
+        row, col = self.state.terrain_cells[terrain_name]
+        terrain_index = self.terrain_indexes[terrain_name]
+        self.draw_tile(row, col, terrain_index)
+
+    def mark_tile_dirty(self, terrain_name):
+        """ Agenda o tile para ser atualizado no próximo render. """
+        self.dirty_tiles.add(terrain_name)
+
+    def render(self):
+        """
+        Atualiza apenas os tiles marcados como alterados, reaproveitando os
+        itens já existentes no canvas.
+
+        :return: Número de itens no canvas após o frame.
+        :rtype: int
+        """
+        while self.dirty_tiles:
+            self.redraw_tile(self.dirty_tiles.pop())
+        return self.canvas_item_count
+
+    def track_item(self, item):
+        """ Conta um item recém-criado, para render() não consultar o canvas a cada frame. """
+        self.canvas_item_count += 1
+        return item
+
+    def player_square_coords(self, x, y, tile_size, role):
+        """ Calcula o retângulo da peça do jogador dentro do tile centrado em (x, y). """
+        player_index = self.state.player_roles.index(role)
         player_square_size = tile_size // 4
         half_player_square_size = player_square_size // 2
 
         square_x1 = x - half_player_square_size
         square_y1 = y - half_player_square_size
-        square_x2 = x + half_player_square_size
-        square_y2 = y + half_player_square_size
 
         part_width = player_square_size // 3
         part_height = player_square_size // 2
@@ -334,75 +391,49 @@ class ForbiddenIslandBoard:
         part_y1 = square_y1 + (row * part_height)
         part_x2 = part_x1 + part_width
         part_y2 = part_y1 + part_height
+        return part_x1, part_y1, part_x2, part_y2
 
+    @timed("board.draw_player_square")
+    def draw_player_square(self, x, y, tile_size, role, highlight=False, highlight_color=None):
+        player_color = self.player_piece_colors[role]
         # Se o highlight está ativo, usa a cor do highlight, senão usa a cor do jogador
         outline_color = highlight_color if highlight else player_color
-        player_rect = self.canvas.create_rectangle(part_x1, part_y1, part_x2, part_y2, fill=player_color, outline=outline_color, width=3 if highlight else 0)
+        player_rect = self.track_item(self.canvas.create_rectangle(*self.player_square_coords(x, y, tile_size, role), fill=player_color, outline=outline_color, width=3 if highlight else 0))
 
         return player_rect
 
     def ask_number_of_players(self):
         """ Pergunta ao usuário o número de jogadores. """
-        # Aqui você pode usar uma caixa de diálogo Tkinter ou um simples input
+        from tkinter import simpledialog
         num_players = simpledialog.askinteger("Número de Jogadores", "Digite o número de jogadores (2, 3 ou 4):", minvalue=2, maxvalue=4)
         return num_players
-    
-    def assign_roles_randomly(self):
-        """ Atribui papéis aos jogadores de forma aleatória. """
-        roles = ["Piloto", "Engenheiro", "Explorador", "Mergulhador", "Mensageiro", "Navegador"]
-        random.shuffle(roles)
-        self.player_roles = roles[:self.num_players]  # Seleciona os papéis com base no número de jogadores
-        print(f"Papéis atribuídos: {self.player_roles}")  # Adicione esta linha para debugar
-
-        
-    @assign_names_decorator
-    def initialize_terrain_names(self):
-        pass
 
     def assign_player_roles(self):
-        # Atribuições dinâmicas baseadas nos terrenos embaralhados
-        self.player_piece_colors = {
-            "Piloto": "#0000FF",         # Azul
-            "Engenheiro": "#FF0000",     # Vermelho
-            "Explorador": "#008000",     # Verde
-            "Mergulhador": "#000000",    # Preto
-            "Mensageiro": "#505050",     # Cinza
-            "Navegador": "#DAA520"       # Amarelo Escuro
-        }
+        # Cores das peças de cada papel
+        self.player_piece_colors = dict(PLAYER_COLORS)
 
     @logging_decorator
     def draw_grid(self):
         """
         Desenha o grid do tabuleiro com os terrenos e tesouros.
         """
-        terrain_index = 0
-        for row in range(self.grid_size):
-            for col in range(self.grid_size):
-                tile_number = row * self.grid_size + col + 1
-                if tile_number not in self.black_tiles_numbers:
-                    # Verificar se o terrain_index ainda está dentro do intervalo antes de desenhar
-                    if terrain_index < len(self.terrain_names):
-                        self.draw_tile(row, col, terrain_index)
-                        terrain_index += 1
-                    else:
-                        print(f"Erro: Não há terrenos suficientes para o tile_number {tile_number}")
+        for terrain_index, (row, col) in enumerate(self.state.cell_terrains):
+            self.terrain_indexes[self.state.terrain_names[terrain_index]] = terrain_index
+            self.draw_tile(row, col, terrain_index)
         self.place_treasures()
         self.canvas.update()
         self.draw_players()  # Chame após desenhar o grid
-        print("Grid desenhado com sucesso")
+        self.render()
+        log.info("Grid desenhado com sucesso")
+
 
-    
     def draw_players(self):
         """ Desenha os jogadores no tabuleiro. """
-        for role, position in self.player_positions.items():
+        for role, position in self.state.player_positions.items():
+            if role in self.player_rectangles:
+                continue  # A peça já existe no canvas
             x, y = self.get_tile_position(position)
-            self.draw_player_square(x, y, self.tile_size, role)  # Passa tile_size como argumento
-    
-    @treasure_decorator
-    def initialize_treasures(self):
-        """ Método para inicializar os tesouros. """
-        pass  # O corpo deste método está vazio, pois a lógica está no decorator
-
+            self.player_rectangles[role] = self.draw_player_square(x, y, self.tile_size, role)  # Passa tile_size como argumento
 
     @tile_status_decorator
     def draw_tile(self, row, col, terrain_index, status=None):
@@ -413,15 +444,12 @@ class ForbiddenIslandBoard:
         y2 = y1 + self.tile_size
 
         # Verifica se o índice do terreno está dentro do alcance antes de desenhar
-        if terrain_index < len(self.terrain_names):
-            terrain_name = self.terrain_names[terrain_index]
+        if terrain_index < len(self.state.terrain_names):
+            terrain_name = self.state.terrain_names[terrain_index]
         else:
-            print(f"Erro: Índice de terreno {terrain_index} fora do alcance.")
+            log.error("Índice de terreno %d fora do alcance.", terrain_index)
             return
 
-        # Desenhar o retângulo do tile
-        self.canvas.create_rectangle(x1, y1, x2, y2, fill='white', outline='black', width=2)
-
         # Definir a cor do texto com base no terreno
         font_color = 'black'
         if terrain_name in self.treasure_colors:
@@ -429,47 +457,107 @@ class ForbiddenIslandBoard:
         elif terrain_name in self.player_piece_colors:
             font_color = self.player_piece_colors[terrain_name]
 
-        # Desenhar o nome do terreno no centro do tile
         center_x = x1 + self.tile_size / 2
         center_y = y1 + self.tile_size / 2
-        self.canvas.create_text(center_x, center_y, text=terrain_name, fill=font_color, font=('Helvetica', 6))
 
         # Atualiza a posição do terreno no dicionário de posições
         self.terrain_positions[terrain_name] = (center_x, center_y)
 
-        # Adicionar status do tile se aplicável
+        # Os itens do tile são criados uma única vez; depois só são atualizados
+        items = self.tile_items.get(terrain_name)
+        if self.sprites is not None:
+            # Com sprites, o tile inteiro é uma imagem; mudar o status só troca a imagem
+            sprite = self.sprites.get(terrain_name, status, font_color)
+            if items is None:
+                self.tile_items[terrain_name] = (self.track_item(self.canvas.create_image(x1, y1, image=sprite, anchor='nw')),)
+            else:
+                self.canvas.coords(items[0], x1, y1)
+                self.canvas.itemconfig(items[0], image=sprite)
+            return
+        if items is None:
+            rect = self.track_item(self.canvas.create_rectangle(x1, y1, x2, y2, fill='white', outline='black', width=2))
+            # Desenhar o nome do terreno no centro do tile
+            label = self.track_item(self.canvas.create_text(center_x, center_y, text=terrain_name, fill=font_color, font=('Helvetica', 6)))
+            status_text = self.track_item(self.canvas.create_text(center_x, center_y + 15, text="", font=('Helvetica', 8)))
+            self.tile_items[terrain_name] = (rect, label, status_text)
+        else:
+            rect, label, status_text = items
+            self.canvas.coords(rect, x1, y1, x2, y2)
+            self.canvas.coords(label, center_x, center_y)
+            self.canvas.coords(status_text, center_x, center_y + 15)
+
+        # Status do tile; vazio quando o tile está normal
         if status != "Normal":
             status_color = 'blue' if status == "Afundando" else 'red'
-            self.canvas.create_text(center_x, center_y + 15, text=status, fill=status_color, font=('Helvetica', 8))
-
-
+            self.canvas.itemconfig(status_text, text=status, fill=status_color)
+        else:
+            self.canvas.itemconfig(status_text, text="")
 
     def get_tile_position(self, terrain_name):
-        position = self.terrain_positions.get(terrain_name, (0, 0))
-        print(f"Posição para {terrain_name}: {position}")  # Debugging
         """ Retorna a posição x, y do centro de um tile com base no nome do terreno. """
         return self.terrain_positions.get(terrain_name, (0, 0))  # Retorna a posição ou (0, 0) se não encontrado
 
     def place_treasures(self):
-       treasure_index = 0
-       for i in range(self.grid_size):
-            if i == 0 or i == self.grid_size - 1:
-                for j in [0, self.grid_size - 1]:
-                    if (i, j) not in self.black_tiles_numbers:
-                        x1 = j * self.tile_size
-                        y1 = i * self.tile_size
-                        treasure_name = self.treasure_names[treasure_index % len(self.treasure_names)]
-                        treasure_color = self.treasure_colors[treasure_name]  # Use a cor correspondente
-                        treasure_index += 1
-                        self.canvas.create_text(x1 + self.tile_size/2, y1 + self.tile_size/2, text=treasure_name, fill=treasure_color, font=('Helvetica', 10, 'bold'))
-    # Inicialização da janela principal do tkinter
-root = tk.Tk()
-root.title("Ilha Proibida Grid de Terrenos")
-
-# Criação da instância da classe ForbiddenIslandBoard e desenho do grid
-board = ForbiddenIslandBoard(root)
-board.draw_grid()
-board.highlight_current_player() 
+        """ Escreve o nome de cada tesouro acima do nome dos terrenos onde ele é capturado. """
+        font_size = max(5, min(10, self.tile_size // 11))  # Cabe no tile também nos grids grandes
+        for treasure_name, terrains in TREASURE_TERRAINS.items():
+            treasure_color = self.treasure_colors[treasure_name]  # Use a cor correspondente
+            for terrain_name in terrains:
+                center_x, center_y = self.get_tile_position(terrain_name)
+                y = center_y - self.tile_size / 4
+                if terrain_name not in self.treasure_items:  # O texto do tesouro é criado uma única vez
+                    self.treasure_items[terrain_name] = self.track_item(self.canvas.create_text(
+                        center_x, y, text=treasure_name, fill=treasure_color, font=('Helvetica', font_size, 'bold')))
+                else:
+                    self.canvas.coords(self.treasure_items[terrain_name], center_x, y)
+                    self.canvas.itemconfig(self.treasure_items[terrain_name], font=('Helvetica', font_size, 'bold'))
+
+
+def main(argv=None):
+    """
+    Abre a janela do jogo. Sem argumentos, pergunta o número de jogadores;
+    também retoma snapshots, entra em mesas do server.py e coloca bots nos papéis.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Ilha Proibida")
+    parser.add_argument("snapshot", nargs="?", help="partida salva com Ctrl+S, retomada sem os diálogos")
+    parser.add_argument("--connect", metavar="HOST:PORTA", help="joga em uma mesa do server.py")
+    parser.add_argument("--table", type=int, help="mesa em que entrar; sem ela, cria uma mesa nova")
+    parser.add_argument("--players", type=int, default=4, choices=(2, 3, 4), help="jogadores da mesa nova")
+    parser.add_argument("--role", help="papel controlado por esta janela; padrão é todos")
+    parser.add_argument("--bots", default="", help="papéis jogados pelo computador, separados por vírgula")
+    parser.add_argument("--bot-time", type=float, default=0.2, help="segundos por jogada do bot")
+    args = parser.parse_args(argv)
 
-# Execução do loop do tkinter
-root.mainloop()
\ No newline at end of file
+    # Inicialização da janela principal do tkinter
+    game_logging.configure_logging()
+    root = load_tk().Tk()
+    root.title("Ilha Proibida Grid de Terrenos")
+
+    # Criação da instância da classe ForbiddenIslandBoard e desenho do grid
+    state = None
+    client = None
+    if args.connect:
+        from client import GameClient
+        host, _, port = args.connect.rpartition(":")
+        client = GameClient(host or "127.0.0.1", int(port))
+        table_id = args.table if args.table is not None else client.create_table(args.players)
+        client.join(table_id, args.role)
+        root.title(f"Ilha Proibida - mesa {table_id}")
+    elif args.snapshot:
+        with open(args.snapshot, "rb") as snapshot:
+            state = GameState.from_bytes(snapshot.read())
+    bot = None
+    bot_roles = [role for role in args.bots.split(",") if role]
+    if bot_roles:
+        from ai import MCTSPlayer
+        bot = MCTSPlayer(args.bot_time)
+    board = ForbiddenIslandBoard(root, state=state, client=client, bot=bot, bot_roles=bot_roles)
+    board.draw_grid()
+    board.highlight_current_player()
+
+    # Execução do loop do tkinter
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+Servidor de partidas em rede da 'Ilha Proibida'.
+
+Um único processo asyncio hospeda muitas mesas; cada mesa é um
+GameState sem interface. Os clientes falam um protocolo de linhas de
+texto em UTF-8. Comandos do cliente:
+
+    NEW <jogadores> [grid] [semente]   cria uma mesa           -> OK <mesa>
+    JOIN <mesa> [papel]                entra na mesa           -> S <mesa> <snapshot em base64>
+    MOVE <N|S|L|O|P>                   age na vez do jogador   -> OK
+    LIST                               mesas abertas           -> L <mesa> <mesa> ...
+    LEAVE                              sai da mesa             -> OK
+    BOT <papel>                        um bot assume o papel   -> OK
+
+O grid de uma mesa vai de MIN_GRID_SIZE a MAX_TABLE_GRID_SIZE tiles de
+lado. Todo comando recebe exatamente uma resposta, na ordem, ou "E <mensagem>"
+em caso de erro. Sem papel no JOIN, a conexão joga por todos os papéis
+(como no tabuleiro local); com papel, só age na vez dele. Papéis sem
+jogador podem ser entregues ao bot MCTS (ai.py), que pensa em um pool
+de processos para não travar as outras mesas. Mesas que ficam sem
+ninguém conectado por TABLE_IDLE_TIMEOUT segundos são fechadas.
+
+Depois do snapshot inicial, cada ação é enviada a todos da mesa como
+uma pequena sequência de diferenças, os mesmos eventos dos listeners do
+GameState:
+
+    A <N|S|L|O|P>                      ação do jogador da vez
+    M <papel> <tile antigo> <tile novo>
+    T <tile> <Normal|Afundando|Afundado>
+    D <papel>                          jogador afogado
+    V                                  passou a vez
+    W <nível>                          a água subiu
+
+Uso: python server.py --port 8765
+"""
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import itertools
+import time
+
+import game_logging
+from ai import DEFAULT_TIME_BUDGET, POOL_OVERHEAD, choose_action
+from engine import MAX_SEED, GameState
+from replay import ACTION_CODES, CODE_ACTIONS
+
+log = game_logging.get_logger("server")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Limite de mesas simultâneas, para limitar a memória do processo
+MAX_TABLES = 1000
+
+# Menor grid que comporta todos os terrenos obrigatórios
+MIN_GRID_SIZE = 5
+
+# Maior grid de uma mesa. O snapshot aceita até MAX_GRID_SIZE, mas a mesa
+# é criada no laço de eventos: um 20x20 leva poucos milissegundos e ocupa
+# ~150 KiB, enquanto um 255x255 trava as outras mesas por ~2 s e ocupa ~25 MB
+MAX_TABLE_GRID_SIZE = 20
+
+# Mesas sem ninguém conectado são fechadas depois desse tempo, em segundos,
+# mesmo com a partida em andamento; a verificação roda a cada REAP_INTERVAL
+TABLE_IDLE_TIMEOUT = 300
+REAP_INTERVAL = 30
+
+# Clientes que acumulam mais que isso sem ler são desconectados
+MAX_WRITE_BUFFER = 256 * 1024
+
+# Primeira palavra das linhas de resposta; as demais linhas são diferenças
+REPLY_KINDS = frozenset({"OK", "S", "L", "E"})
+
+
+def encode_event(state, event, args):
+    """
+    Converte um evento do GameState em uma linha do protocolo.
+
+    :return: Linha sem o "\\n" final, ou None para eventos que não vão para a rede.
+    :rtype: str
+    """
+    if event == "action":
+        return "A " + ACTION_CODES[args[0]]
+    if event == "tile_status":
+        return f"T {args[0]} {args[1]}"
+    if event == "player_moved":
+        role, old_terrain, new_terrain = args
+        return f"M {role} {state.tile_number_of(old_terrain)} {state.tile_number_of(new_terrain)}"
+    if event == "player_drowned":
+        return "D " + args[0]
+    if event == "turn":
+        return "V"
+    if event == "water_level":
+        return f"W {args[0]}"
+    return None
+
+
+class Table:
+    """
+    Uma mesa: o estado do jogo, as conexões inscritas e as diferenças
+    ainda não enviadas.
+
+    :param table_id: Número da mesa.
+    :param state: Estado do jogo.
+    :type state: GameState
+    """
+    __slots__ = ("table_id", "state", "connections", "claimed_roles", "bot_roles", "bot_thinking", "outbox",
+                 "empty_since")
+
+    def __init__(self, table_id, state):
+        self.table_id = table_id
+        self.state = state
+        self.connections = set()
+        self.claimed_roles = {}  # Papel -> conexão que o controla
+        self.bot_roles = set()
+        self.bot_thinking = False
+        self.outbox = []
+        self.empty_since = time.monotonic()  # Momento em que a última conexão saiu; None com alguém na mesa
+        state.listeners.append(self.on_state_change)
+
+    def on_state_change(self, event, *args):
+        line = encode_event(self.state, event, args)
+        if line is not None:
+            self.outbox.append(line)
+
+    def flush(self):
+        """ Envia de uma vez as diferenças acumuladas a todos da mesa. """
+        if not self.outbox:
+            return
+        data = ("\n".join(self.outbox) + "\n").encode("utf-8")
+        self.outbox.clear()
+        for connection in list(self.connections):
+            connection.send(data)
+
+class Connection:
+    """ Um cliente conectado e a mesa em que está. """
+    __slots__ = ("writer", "table", "role")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.table = None
+        self.role = None
+
+    def send(self, data):
+        if self.writer.is_closing():
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            log.warning("Cliente lento desconectado")
+            self.writer.close()
+            return
+        self.writer.write(data)
+
+    def send_line(self, line):
+        self.send((line + "\n").encode("utf-8"))
+
+
+class GameServer:
+    """
+    Mantém as mesas e atende as conexões. As mesas vivem no laço de
+    eventos do asyncio, sem threads: cada comando é aplicado de uma vez.
+    """
+    def __init__(self, max_tables=MAX_TABLES, bot_time_budget=DEFAULT_TIME_BUDGET, bot_workers=None):
+        self.tables = {}
+        self.table_ids = itertools.count(1)
+        self.max_tables = max_tables
+        self.bot_time_budget = bot_time_budget
+        self.bot_workers = bot_workers
+        self.bot_executor = None  # Criado na primeira jogada de um bot
+        self.server = None
+        self.reaper = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """ Abre o socket; com `port=0` o sistema escolhe a porta (veja self.port). """
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        self.reaper = asyncio.get_running_loop().create_task(self.reap_loop())
+        log.info("Servidor ouvindo em %s:%d", host, self.port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle_connection(self, reader, writer):
+        connection = Connection(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # readline() troca LimitOverrunError por ValueError
+                    connection.send_line("E linha longa demais")
+                    break
+                if not line:
+                    break
+                try:
+                    reply = self.handle_command(connection, line.decode("utf-8").split())
+                except ValueError as error:
+                    reply = f"E {error}"
+                connection.send_line(reply)
+                if writer.is_closing():
+                    break
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.leave(connection)
+            writer.close()
+
+    def handle_command(self, connection, words):
+        """
+        Aplica um comando do protocolo.
+
+        :param connection: Conexão que enviou o comando.
+        :param words: Linha do comando separada em palavras.
+        :return: Linha de resposta.
+        :rtype: str
+        :raises ValueError: Se o comando for inválido; vira uma resposta "E".
+        """
+        if not words:
+            raise ValueError("comando vazio")
+        command, args = words[0].upper(), words[1:]
+        if command == "MOVE" and len(args) == 1:
+            return self.move(connection, args[0])
+        if command == "NEW" and 1 <= len(args) <= 3:
+            return f"OK {self.new_table(*map(int, args))}"
+        if command == "JOIN" and 1 <= len(args) <= 2:
+            return self.join(connection, int(args[0]), *args[1:])
+        if command == "LIST" and not args:
+            return " ".join(["L"] + [str(table_id) for table_id in self.tables])
+        if command == "LEAVE" and not args:
+            self.leave(connection)
+            return "OK"
+        if command == "BOT" and len(args) == 1:
+            return self.add_bot(connection, args[0])
+        raise ValueError(f"comando desconhecido: {' '.join(words)}")
+
+    def new_table(self, num_players, grid_size=6, seed=None):
+        """ Cria uma mesa e retorna o seu número. """
+        if len(self.tables) >= self.max_tables:
+            self.reap_tables()
+        if len(self.tables) >= self.max_tables:
+            raise ValueError("limite de mesas atingido")
+        if not 2 <= num_players <= 4:
+            raise ValueError("a mesa deve ter de 2 a 4 jogadores")
+        if not MIN_GRID_SIZE <= grid_size <= MAX_TABLE_GRID_SIZE:
+            raise ValueError(f"o grid deve ter de {MIN_GRID_SIZE} a {MAX_TABLE_GRID_SIZE} tiles de lado")
+        if seed is not None and not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"a semente deve estar entre 0 e {MAX_SEED}")
+        table_id = next(self.table_ids)
+        self.tables[table_id] = Table(table_id, GameState(num_players, grid_size, seed=seed))
+        log.info("Mesa %d criada (%d jogadores, grid %d)", table_id, num_players, grid_size)
+        return table_id
+
+    def join(self, connection, table_id, role=None):
+        table = self.tables.get(table_id)
+        if table is None:
+            raise ValueError(f"mesa {table_id} não existe")
+        if role is not None:
+            if role not in table.state.player_turn_order:
+                raise ValueError(f"papel {role} não está na mesa")
+            if role in table.claimed_roles or role in table.bot_roles:
+                raise ValueError(f"papel {role} já está ocupado")
+        self.leave(connection)
+        connection.table = table
+        connection.role = role
+        table.connections.add(connection)
+        table.empty_since = None
+        if role is not None:
+            table.claimed_roles[role] = connection
+        snapshot = base64.b64encode(table.state.to_bytes()).decode("ascii")
+        return f"S {table_id} {snapshot}"
+
+    def leave(self, connection):
+        table = connection.table
+        if table is None:
+            return
+        table.connections.discard(connection)
+        if connection.role is not None:
+            table.claimed_roles.pop(connection.role, None)
+        connection.table = None
+        connection.role = None
+        if not table.connections:
+            if table.state.is_over():
+                self.tables.pop(table.table_id, None)  # Partida encerrada e sem ninguém olhando
+            else:
+                table.empty_since = time.monotonic()  # Abandonada; reap_tables a fecha se ninguém voltar
+
+    def reap_tables(self, now=None):
+        """
+        Fecha as mesas sem ninguém conectado há mais de TABLE_IDLE_TIMEOUT
+        segundos, inclusive as criadas com NEW e nunca usadas.
+
+        :param now: Momento atual em time.monotonic(); padrão é agora.
+        :return: Número de mesas fechadas.
+        :rtype: int
+        """
+        if now is None:
+            now = time.monotonic()
+        abandoned = [table_id for table_id, table in self.tables.items()
+                     if table.empty_since is not None and now - table.empty_since >= TABLE_IDLE_TIMEOUT]
+        for table_id in abandoned:
+            del self.tables[table_id]
+        if abandoned:
+            log.info("%d mesas abandonadas fechadas", len(abandoned))
+        return len(abandoned)
+
+    async def reap_loop(self):
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            self.reap_tables()
+
+    def move(self, connection, code):
+        table = connection.table
+        if table is None:
+            raise ValueError("entre em uma mesa com JOIN")
+        action = CODE_ACTIONS.get(code.upper())
+        if action is None:
+            raise ValueError(f"ação desconhecida: {code}")
+        state = table.state
+        if state.is_over():
+            raise ValueError("a partida terminou")
+        if connection.role is not None and connection.role != state.current_role():
+            raise ValueError(f"é a vez de {state.current_role()}")
+        if action == "passar":
+            state.pass_turn()
+        elif state.move_player(action) is None:
+            raise ValueError(f"movimento inválido: {action}")
+        table.flush()
+        self.schedule_bot(table)
+        return "OK"
+
+    def add_bot(self, connection, role):
+        table = connection.table
+        if table is None:
+            raise ValueError("entre em uma mesa com JOIN")
+        if role not in table.state.player_turn_order:
+            raise ValueError(f"papel {role} não está na mesa")
+        if role in table.claimed_roles or role in table.bot_roles:
+            raise ValueError(f"papel {role} já está ocupado")
+        table.bot_roles.add(role)
+        self.schedule_bot(table)
+        return "OK"
+
+    def schedule_bot(self, table):
+        """ Se a vez é de um bot, agenda a jogada dele sem bloquear o laço de eventos. """
+        state = table.state
+        if table.bot_thinking or state.is_over() or state.current_role() not in table.bot_roles:
+            return
+        table.bot_thinking = True
+        asyncio.get_running_loop().create_task(self.play_bot(table))
+
+    async def play_bot(self, table):
+        state = table.state
+        turn_count = state.turn_count
+        if self.bot_executor is None:
+            self.bot_executor = concurrent.futures.ProcessPoolExecutor(self.bot_workers)
+        try:
+            action = await asyncio.get_running_loop().run_in_executor(
+                self.bot_executor, choose_action, state, max(0.001, self.bot_time_budget - POOL_OVERHEAD))
+        finally:
+            table.bot_thinking = False
+        if self.tables.get(table.table_id) is not table or state.turn_count != turn_count or action is None:
+            return  # A mesa foi fechada ou o estado mudou enquanto o bot pensava
+        state.apply_action(action)
+        table.flush()
+        self.schedule_bot(table)
+
+    def close(self):
+        if self.reaper is not None:
+            self.reaper.cancel()
+            self.reaper = None
+        if self.bot_executor is not None:
+            self.bot_executor.shutdown(cancel_futures=True)
+            self.bot_executor = None
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, bot_time_budget=DEFAULT_TIME_BUDGET):
+    game_server = GameServer(bot_time_budget=bot_time_budget)
+    server = await game_server.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        game_server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de partidas em rede da Ilha Proibida")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="endereço de escuta")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="porta TCP")
+    parser.add_argument("--bot-time", type=float, default=DEFAULT_TIME_BUDGET, help="segundos por jogada dos bots")
+    parser.add_argument("--log", help="níveis de log, por exemplo INFO,server=DEBUG (padrão: variável ILHA_LOG)")
+    args = parser.parse_args(argv)
+    game_logging.configure_logging(args.log)
+    try:
+        asyncio.run(serve(args.host, args.port, args.bot_time))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Simulador Monte Carlo do jogo 'Ilha Proibida'.
+
+Joga N partidas completas a partir de sementes, distribuídas entre os
+núcleos da máquina, e reúne taxa de vitória, duração das partidas e
+ordem em que os terrenos afundam.
+
+Uso: python simulator.py --games 100000 --players 4 --policy guloso
+"""
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import random
+from collections import Counter
+
+import game_logging
+from constants import DIRECTION_OFFSETS, ESCAPE_TERRAIN, TREASURE_TERRAINS
+from engine import GameState
+from replay import GameRecorder
+
+
+def random_policy(state):
+    """
+    Escolhe uma direção válida ao acaso. O sorteio usa um gerador próprio,
+    derivado da semente e do turno, e nunca state.rng: as cartas de
+    inundação continuam as mesmas que replay.replay() reproduz.
+    """
+    directions = state.valid_directions()
+    if not directions:
+        return None
+    return random.Random(f"policy:{state.seed}:{state.turn_count}").choice(directions)
+
+def greedy_policy(state):
+    """
+    Aproxima o jogador do terreno de tesouro não capturado mais próximo;
+    com todos os tesouros capturados, segue para o Heliponto.
+    """
+    directions = state.valid_directions()
+    if not directions:
+        return None
+    targets = [terrain for treasure, terrains in TREASURE_TERRAINS.items()
+               if treasure not in state.captured_treasures
+               for terrain in terrains if state.is_walkable(terrain)]
+    if not targets:
+        targets = [ESCAPE_TERRAIN]
+    target_cells = [state.terrain_cells[terrain] for terrain in targets]
+    row, col = state.terrain_cells[state.player_positions[state.current_role()]]
+
+    def distance(direction):
+        d_row, d_col = DIRECTION_OFFSETS[direction]
+        return min(abs(row + d_row - t_row) + abs(col + d_col - t_col) for t_row, t_col in target_cells)
+
+    return min(directions, key=distance)
+
+POLICIES = {
+    "aleatorio": random_policy,
+    "guloso": greedy_policy
+}
+
+def resolve_policy(name):
+    """
+    Retorna a função de política pelo nome. Aceita os nomes de POLICIES
+    ou um caminho "modulo:funcao" para políticas externas.
+
+    :param name: Nome da política.
+    :type name: str
+    :return: Função que recebe um GameState e retorna uma direção ou None.
+    :rtype: function
+    """
+    if name in POLICIES:
+        return POLICIES[name]
+    if ":" in name:
+        module_name, func_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), func_name)
+    raise ValueError(f"Política desconhecida: {name}")
+
+
+def play_game(seed, num_players, policy, max_turns=500, recorder=None, grid_size=6):
+    """
+    Joga uma partida completa sem interface gráfica.
+
+    :param seed: Semente da partida.
+    :param num_players: Número de jogadores.
+    :param policy: Função que escolhe a direção do jogador da vez.
+    :param max_turns: Limite de turnos; ao atingi-lo a partida é perdida.
+    :param recorder: GameRecorder que grava as ações da partida, opcional.
+    :param grid_size: Tamanho do grid da ilha.
+    :return: Tupla (vitória, número de turnos, ordem de afundamento).
+    :rtype: tuple
+    """
+    state = GameState(num_players, grid_size, seed=seed)
+    if recorder is not None:
+        recorder.attach(state)
+    while True:
+        direction = policy(state)
+        if direction is None or state.move_player(direction) is None:
+            state.pass_turn()  # Sem movimento possível: passa a vez
+        if state.is_won():
+            return True, state.turn_count, state.sink_order
+        if state.is_lost() or state.turn_count >= max_turns:
+            return False, state.turn_count, state.sink_order
+
+
+class SimulationStats:
+    """
+    Estatísticas agregadas de um lote de partidas. Lotes calculados em
+    processos diferentes são combinados com merge().
+    """
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.total_turns = 0
+        self.min_turns = None
+        self.max_turns = 0
+        self.first_sunk = Counter()  # Terreno -> vezes em que foi o primeiro a afundar
+        self.sink_counts = Counter()  # Terreno -> vezes em que afundou
+        self.sink_position_sum = Counter()  # Terreno -> soma das posições na ordem de afundamento
+
+    def add(self, won, turns, sink_order):
+        self.games += 1
+        self.wins += won
+        self.total_turns += turns
+        self.min_turns = turns if self.min_turns is None else min(self.min_turns, turns)
+        self.max_turns = max(self.max_turns, turns)
+        if sink_order:
+            self.first_sunk[sink_order[0]] += 1
+        for position, terrain in enumerate(sink_order, 1):
+            self.sink_counts[terrain] += 1
+            self.sink_position_sum[terrain] += position
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.total_turns += other.total_turns
+        if other.min_turns is not None:
+            self.min_turns = other.min_turns if self.min_turns is None else min(self.min_turns, other.min_turns)
+        self.max_turns = max(self.max_turns, other.max_turns)
+        self.first_sunk.update(other.first_sunk)
+        self.sink_counts.update(other.sink_counts)
+        self.sink_position_sum.update(other.sink_position_sum)
+        return self
+
+    def summary(self):
+        """ Retorna as estatísticas em um dicionário serializável em JSON. """
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "win_rate": self.wins / self.games if self.games else 0.0,
+            "mean_turns": self.total_turns / self.games if self.games else 0.0,
+            "min_turns": self.min_turns,
+            "max_turns": self.max_turns,
+            "first_sunk": dict(self.first_sunk.most_common()),
+            "mean_sink_position": {
+                terrain: self.sink_position_sum[terrain] / count
+                for terrain, count in self.sink_counts.most_common()
+            }
+        }
+
+
+def run_batch(batch):
+    """
+    Joga um lote de partidas com sementes consecutivas. Executado nos
+    processos do pool; recebe apenas dados serializáveis.
+
+    :param batch: Tupla (primeira semente, quantidade, jogadores, política, limite de turnos,
+        diretório de registro ou None, tamanho do grid).
+    :return: Estatísticas do lote.
+    :rtype: SimulationStats
+    """
+    first_seed, count, num_players, policy_name, max_turns, record_dir, grid_size = batch
+    policy = resolve_policy(policy_name)
+    stats = SimulationStats()
+    if record_dir is None:
+        for seed in range(first_seed, first_seed + count):
+            stats.add(*play_game(seed, num_players, policy, max_turns, grid_size=grid_size))
+        return stats
+    # Um registro por lote, para que os processos não escrevam no mesmo arquivo
+    with open(os.path.join(record_dir, f"lote-{first_seed}.log"), "a", encoding="utf-8") as stream:
+        recorder = GameRecorder(stream)
+        for seed in range(first_seed, first_seed + count):
+            stats.add(*play_game(seed, num_players, policy, max_turns, recorder, grid_size))
+    return stats
+
+def simulate(games, num_players=4, policy="guloso", workers=None, seed=0, max_turns=500, batch_size=1000,
+             record_dir=None, grid_size=6):
+    """
+    Joga `games` partidas distribuídas em um pool de processos.
+
+    :param games: Número de partidas.
+    :param num_players: Número de jogadores por partida.
+    :param policy: Nome da política dos jogadores.
+    :param workers: Número de processos; padrão é o número de núcleos. Com 1, roda no processo atual.
+    :param seed: Semente da primeira partida; as demais usam sementes consecutivas.
+    :param max_turns: Limite de turnos por partida.
+    :param batch_size: Partidas por tarefa enviada ao pool.
+    :param record_dir: Diretório onde gravar os registros das partidas (ver replay.py), opcional.
+    :param grid_size: Tamanho do grid da ilha.
+    :return: Estatísticas agregadas.
+    :rtype: SimulationStats
+    """
+    resolve_policy(policy)  # Falha cedo se a política não existir
+    if record_dir is not None:
+        os.makedirs(record_dir, exist_ok=True)
+    batches = [
+        (first_seed, min(batch_size, seed + games - first_seed), num_players, policy, max_turns, record_dir,
+         grid_size)
+        for first_seed in range(seed, seed + games, batch_size)
+    ]
+    stats = SimulationStats()
+    if workers == 1:
+        for batch in batches:
+            stats.merge(run_batch(batch))
+        return stats
+    with multiprocessing.Pool(workers) as pool:
+        for batch_stats in pool.imap_unordered(run_batch, batches):
+            stats.merge(batch_stats)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador Monte Carlo da Ilha Proibida")
+    parser.add_argument("--games", type=int, default=10000, help="número de partidas")
+    parser.add_argument("--players", type=int, default=4, choices=(2, 3, 4), help="jogadores por partida")
+    parser.add_argument("--policy", default="guloso", help="política dos jogadores: %s ou modulo:funcao" % ", ".join(POLICIES))
+    parser.add_argument("--workers", type=int, default=None, help="processos no pool (padrão: todos os núcleos)")
+    parser.add_argument("--seed", type=int, default=0, help="semente da primeira partida")
+    parser.add_argument("--max-turns", type=int, default=500, help="limite de turnos por partida")
+    parser.add_argument("--batch-size", type=int, default=1000, help="partidas por tarefa do pool")
+    parser.add_argument("--json", help="arquivo onde gravar as estatísticas em JSON")
+    parser.add_argument("--record-dir", help="diretório onde gravar o registro de cada partida")
+    parser.add_argument("--grid-size", type=int, default=6, help="tamanho do grid da ilha")
+    parser.add_argument("--log", help="níveis de log, por exemplo INFO,engine=DEBUG (padrão: variável ILHA_LOG)")
+    args = parser.parse_args(argv)
+    game_logging.configure_logging(args.log)
+
+    stats = simulate(args.games, args.players, args.policy, args.workers, args.seed, args.max_turns, args.batch_size,
+                     args.record_dir, args.grid_size)
+    summary = stats.summary()
+    print(f"Partidas: {summary['games']}")
+    print(f"Taxa de vitória: {summary['win_rate']:.2%}")
+    print(f"Duração média: {summary['mean_turns']:.1f} turnos (mín. {summary['min_turns']}, máx. {summary['max_turns']})")
+    print("Primeiros terrenos a afundar:")
+    for terrain, count in list(summary["first_sunk"].items())[:5]:
+        print(f"  {terrain}: {count}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump(summary, output, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
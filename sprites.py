@@ -0,0 +1,99 @@
+"""
+Imagens pré-renderizadas dos tiles do tabuleiro.
+
+Desenhar texto é a operação mais cara do Canvas. Com o Pillow instalado,
+cada terreno é renderizado uma única vez por status (Normal, Afundando,
+Afundado) em uma imagem, e o tabuleiro passa a trocar apenas a imagem do
+tile quando o status muda. O cache só é descartado quando o tamanho dos
+tiles muda. Sem o Pillow (dependência opcional), SPRITES_AVAILABLE é
+False e o tabuleiro continua desenhando retângulos e textos no Canvas.
+O Pillow só é importado quando o primeiro SpriteCache é criado.
+"""
+import importlib.util
+
+# Pillow é opcional; só é importado quando o primeiro cache de sprites é criado
+SPRITES_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+Image = ImageDraw = ImageFont = ImageTk = None
+
+# Fontes tentadas em ordem; se nenhuma existir, usa a fonte embutida do Pillow
+FONT_FILES = ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf")
+
+STATUS_COLORS = {
+    "Afundando": "blue",
+    "Afundado": "red"
+}
+
+
+def load_pillow():
+    global Image, ImageDraw, ImageFont, ImageTk
+    if Image is None:
+        from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+def load_font(size):
+    for font_file in FONT_FILES:
+        try:
+            return ImageFont.truetype(font_file, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+class SpriteCache:
+    """
+    Imagens dos tiles indexadas por (terreno, status).
+
+    :param tile_size: Lado do tile, em pixels.
+    :type tile_size: int
+    """
+    def __init__(self, tile_size):
+        load_pillow()
+        self.tile_size = tile_size
+        self.images = {}
+        self.name_font = None
+        self.status_font = None
+
+    def resize(self, tile_size):
+        """ Troca o tamanho dos tiles; só então as imagens são descartadas. """
+        if tile_size != self.tile_size:
+            self.tile_size = tile_size
+            self.images.clear()
+            self.name_font = None
+            self.status_font = None
+
+    def get(self, terrain_name, status, font_color="black"):
+        """
+        Imagem do tile, renderizada na primeira vez em que é pedida.
+
+        :param terrain_name: Nome do terreno.
+        :param status: "Normal", "Afundando" ou "Afundado".
+        :param font_color: Cor do nome do terreno.
+        :rtype: ImageTk.PhotoImage
+        """
+        key = (terrain_name, status)
+        image = self.images.get(key)
+        if image is None:
+            image = ImageTk.PhotoImage(self.render(terrain_name, status, font_color))
+            self.images[key] = image  # O Tk descarta a imagem se ninguém guardar a referência
+        return image
+
+    def render(self, terrain_name, status, font_color):
+        size = self.tile_size
+        if self.name_font is None:
+            # As fontes 6 e 8 do Canvas têm cerca de 8 e 11 pixels em um tile de 110
+            self.name_font = load_font(max(7, size * 8 // 110))
+            self.status_font = load_font(max(8, size * 11 // 110))
+        image = Image.new("RGB", (size, size), "white")
+        draw = ImageDraw.Draw(image)
+        draw.rectangle((0, 0, size - 1, size - 1), outline="black", width=2)
+        center = size / 2
+        self.draw_centered(draw, center, center, terrain_name, font_color, self.name_font)
+        if status in STATUS_COLORS:
+            self.draw_centered(draw, center, center + size * 15 / 110, status, STATUS_COLORS[status], self.status_font)
+        return image
+
+    @staticmethod
+    def draw_centered(draw, x, y, text, color, font):
+        # textbbox em vez de anchor="mm", que a fonte embutida antiga não aceita
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        draw.text((x - (left + right) / 2, y - (top + bottom) / 2), text, fill=color, font=font)
@@ -0,0 +1,28 @@
+"""
+Configuração do pytest: os módulos do jogo ficam na raiz do repositório.
+Também traz os auxiliares de partida usados por vários arquivos de teste.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator import greedy_policy  # noqa: E402 (depende do sys.path acima)
+
+
+def greedy_action(state):
+    """ Ação da política gulosa, passando a vez quando não há movimento. """
+    return greedy_policy(state) or "passar"
+
+def play(state, turns, policy=greedy_action):
+    """
+    Joga até `turns` turnos ou até o fim da partida.
+
+    :param policy: Função que recebe o estado e retorna uma ação de legal_actions().
+    :return: O próprio estado.
+    """
+    for _ in range(turns):
+        if state.is_over():
+            break
+        state.apply_action(policy(state))
+    return state
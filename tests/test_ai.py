@@ -0,0 +1,45 @@
+import time
+
+from ai import MCTSPlayer, TranspositionTable, choose_action
+from conftest import play
+from engine import GameState
+
+
+def test_bot_wins_at_least_as_often_as_greedy():
+    # Iterações fixas e tempo de sobra: a busca é reproduzível
+    def bot(state):
+        return choose_action(state, time_budget=60, seed=state.turn_count, max_iterations=8)
+
+    seeds = range(30)
+    greedy_wins = sum(play(GameState(4, seed=seed), 500).is_won() for seed in seeds)
+    bot_wins = sum(play(GameState(4, seed=seed), 500, bot).is_won() for seed in seeds)
+    assert bot_wins >= greedy_wins
+    assert bot_wins > 0
+
+
+def test_choose_action_does_not_change_state():
+    state = GameState(4, seed=3)
+    before = state.to_bytes()
+    assert choose_action(state, time_budget=60, seed=0, max_iterations=2) in state.legal_actions()
+    assert state.to_bytes() == before
+
+
+def test_choose_stays_within_budget_on_large_board():
+    state = GameState(4, 20, seed=1)
+    player = MCTSPlayer(0.2, seed=0)
+    for _ in range(3):
+        start = time.perf_counter()
+        action = player.choose(state)
+        assert time.perf_counter() - start < 0.2
+        state.apply_action(action)
+
+
+def test_select_widens_from_the_preferred_action():
+    table = TranspositionTable(exploration=0.3, widening=1.0)
+    actions = ["norte", "sul", "passar"]
+    assert table.select("nó", actions, "sul") == ("sul", True)
+    table.backpropagate([("nó", "sul")], 0.0)
+    assert table.select("nó", actions, "sul") == ("norte", True)
+    table.backpropagate([("nó", "norte")], 1.0)
+    # Duas visitas ainda dão duas candidatas: "passar" espera e UCB1 escolhe entre as tentadas
+    assert table.select("nó", actions, "sul") == ("norte", False)
@@ -0,0 +1,37 @@
+"""
+Testes do IslandBits mantido pelo GameState.
+"""
+import pickle
+
+from bitboard import IslandBits
+from conftest import play
+from engine import GameState
+
+
+def test_bits_follow_the_engine():
+    for seed in range(30):
+        state = GameState(4, seed=seed)
+        while not state.is_over() and state.turn_count < 100:
+            play(state, 1)
+            assert state.bits == IslandBits.from_state(state)
+
+def test_valid_moves_match_valid_directions():
+    state = GameState(4, seed=11)
+    for _ in range(12):
+        state.pass_turn()
+    assert state.sinking_tiles
+    for index, role in enumerate(state.player_roles):
+        position = state.player_positions[role]
+        expected = {state.tile_number_of(neighbor) - 1 for neighbor in state.neighbors[position].values()
+                    if state.is_walkable(neighbor)}
+        moves = state.bits.valid_moves(index)
+        assert {cell for cell in range(state.grid_size ** 2) if moves >> cell & 1} == expected
+
+def test_copies_and_snapshots_keep_the_bits():
+    state = GameState(3, seed=5)
+    play(state, 8)
+    copy = state.copy()
+    assert copy.bits == state.bits and copy.state_key() == state.state_key()
+    play(copy, 1)
+    assert state.bits == IslandBits.from_state(state)
+    assert pickle.loads(pickle.dumps(state)).state_key() == state.state_key()
@@ -0,0 +1,48 @@
+"""
+Testes do tabuleiro gráfico com o canvas stub do benchmark, sem abrir janelas.
+"""
+import pytest
+
+import benchmark
+import run
+from constants import TREASURE_TERRAINS
+from engine import GameState
+
+
+@pytest.fixture
+def make_board(monkeypatch):
+    monkeypatch.setattr(run, "tk", benchmark.STUB_TK)
+
+    def make(grid_size=6, seed=0):
+        board = run.ForbiddenIslandBoard(benchmark.StubWidget(), state=GameState(4, grid_size, seed=seed),
+                                         use_sprites=False)
+        board.draw_grid()
+        board.highlight_current_player()
+        return board
+    return make
+
+
+@pytest.mark.parametrize("grid_size", [6, 20])
+def test_treasure_markers_sit_on_their_terrain_tiles(make_board, grid_size):
+    board = make_board(grid_size)
+    expected = {terrain for terrains in TREASURE_TERRAINS.values() for terrain in terrains}
+    assert set(board.treasure_items) == expected
+    for terrain_name, item in board.treasure_items.items():
+        x, y = board.canvas.coords(item)
+        row, col = board.state.terrain_cells[terrain_name]
+        assert int(x) // board.tile_size == col and int(y) // board.tile_size == row
+
+
+def test_canvas_item_count_stays_constant_over_many_moves(make_board):
+    board = make_board()
+    created = board.canvas_item_count
+    assert created == len(board.canvas.find_all())
+    seed = 0
+    for _ in range(10000):
+        if board.state.is_over():
+            seed += 1
+            board = make_board(seed=seed)
+        directions = board.state.valid_directions() or ["passar"]
+        board.queue_move(directions[board.state.turn_count % len(directions)])
+        board.process_frame()
+        assert board.render() == created == len(board.canvas.find_all())
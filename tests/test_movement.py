@@ -0,0 +1,63 @@
+"""
+Testes do serviço de alcance (movement.py).
+"""
+from engine import GameState
+from movement import MovementService
+
+
+def sunk_state(seed=11, passes=12):
+    state = GameState(4, seed=seed)
+    for _ in range(passes):
+        state.pass_turn()
+    return state
+
+
+def test_one_step_reach_matches_the_engine():
+    state = sunk_state()
+    movement = MovementService(state)
+    for role, position in state.player_positions.items():
+        expected = {state.neighbors[position][direction] for direction in state.valid_directions()} \
+            if role == state.current_role() else None
+        reach = movement.reachable(None, position)
+        assert set(reach.values()) <= {1}
+        if expected is not None:
+            assert set(reach) == expected
+
+def test_distances_avoid_sunk_tiles():
+    state = sunk_state()
+    movement = MovementService(state)
+    goal = next(terrain for terrain in state.terrain_cells if state.is_walkable(terrain))
+    distances = movement.distances_to(frozenset((goal,)))
+    for terrain, distance in distances.items():
+        assert state.is_walkable(terrain)
+        path = movement.shortest_path(None, terrain, goal)
+        assert len(path) - 1 == distance
+    for terrain in state.terrain_cells:
+        if not state.is_walkable(terrain):
+            assert terrain not in distances
+
+def test_cache_follows_tile_changes():
+    state = GameState(4, seed=3)
+    movement = MovementService(state)
+    start = state.player_positions[state.current_role()]
+    before = dict(movement.reachable("Piloto", start))
+    neighbor = next(iter(state.neighbors[start].values()))
+    tile_number = state.tile_number_of(neighbor)
+    state.flood_tile(tile_number)
+    assert movement.reachable("Piloto", start) == before  # Alagado ainda recebe jogadores
+    state.flood_tile(tile_number)
+    assert neighbor not in movement.reachable("Piloto", start)
+    assert neighbor in before
+
+def test_observe_switches_to_a_copy():
+    state = GameState(4, seed=3)
+    movement = MovementService(state)
+    copy = state.copy()
+    terrain = next(iter(copy.terrain_cells))
+    tile_number = copy.tile_number_of(terrain)
+    copy.flood_tile(tile_number)
+    copy.flood_tile(tile_number)
+    goals = frozenset(state.terrain_cells)
+    assert terrain in movement.distances_to(goals)
+    movement.observe(copy)
+    assert terrain not in movement.distances_to(goals)
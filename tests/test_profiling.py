@@ -0,0 +1,20 @@
+from profiling import Reservoir, TimerRegistry
+
+
+def test_reservoir_is_bounded_but_counts_are_exact():
+    samples = Reservoir(size=100)
+    for duration in range(1, 10001):
+        samples.append(duration)
+    assert len(samples.samples) == 100
+    assert samples.count == 10000
+    assert samples.total == sum(range(1, 10001))
+    assert samples.max == 10000
+
+
+def test_stats_use_exact_totals():
+    registry = TimerRegistry()
+    for duration in range(1000):
+        registry.record("board.turn", duration * 1000)
+    stats = registry.stats()["board.turn"]
+    assert stats["calls"] == 1000
+    assert 0 < stats["p50_us"] < stats["p99_us"] <= stats["max_us"] == 999
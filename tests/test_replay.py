@@ -0,0 +1,36 @@
+"""
+Testes do registro e da reprodução de partidas.
+"""
+import io
+
+from replay import GameRecorder, read_games, replay
+from simulator import greedy_policy, play_game, random_policy
+
+
+def record(policy, seeds):
+    stream = io.StringIO()
+    recorder = GameRecorder(stream)
+    results = [play_game(seed, 4, policy, recorder=recorder) for seed in seeds]
+    stream.seek(0)
+    return results, list(read_games(stream))
+
+def check_round_trip(policy):
+    results, games = record(policy, range(200))
+    assert len(games) == len(results)
+    for (won, turns, sink_order), (header, actions) in zip(results, games):
+        state = replay(header, actions)
+        assert state.turn_count == turns
+        assert state.sink_order == sink_order
+        assert state.is_won() == won
+
+
+def test_random_policy_replays():
+    check_round_trip(random_policy)
+
+def test_greedy_policy_replays():
+    check_round_trip(greedy_policy)
+
+def test_replay_stops_midway():
+    _, games = record(random_policy, [3])
+    header, actions = games[0]
+    assert replay(header, actions, stop=5).turn_count == 5
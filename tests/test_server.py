@@ -0,0 +1,152 @@
+"""
+Testes do servidor de partidas: os comandos sem sockets e, no fim, mesas
+jogadas por GameClient em localhost.
+"""
+import asyncio
+import base64
+import socket
+import threading
+import time
+
+import pytest
+
+from client import GameClient
+from conftest import greedy_action
+from engine import GameState
+from server import TABLE_IDLE_TIMEOUT, Connection, GameServer
+
+
+@pytest.mark.parametrize("words", [
+    ["NEW", "2", "6", "-1"],
+    ["NEW", "2", "6", str(2 ** 64)],
+    ["NEW", "2", "300"],
+    ["NEW", "2", "255"],
+    ["NEW", "2", "4"],
+    ["NEW", "5"],
+])
+def test_new_rejects_tables_that_cannot_be_played(words):
+    server = GameServer()
+    with pytest.raises(ValueError):
+        server.handle_command(Connection(None), words)
+    assert not server.tables
+
+def test_join_sends_a_snapshot_of_the_table():
+    server = GameServer()
+    connection = Connection(None)
+    table_id = int(server.handle_command(connection, ["NEW", "3", "6", "42"]).split()[1])
+    kind, joined_id, snapshot = server.handle_command(connection, ["JOIN", str(table_id)]).split()
+    assert (kind, int(joined_id)) == ("S", table_id)
+    assert GameState.from_bytes(base64.b64decode(snapshot)).to_bytes() == server.tables[table_id].state.to_bytes()
+
+def test_abandoned_tables_are_reaped():
+    server = GameServer()
+    connection = Connection(None)
+    unused = server.new_table(2)
+    abandoned = server.new_table(2)
+    watched = server.new_table(2)
+    server.join(connection, abandoned)
+    server.leave(connection)
+    server.join(Connection(None), watched)
+    assert not server.tables[abandoned].state.is_over()
+
+    # Momentos explícitos: start + TABLE_IDLE_TIMEOUT - start pode dar um pouco menos que o limite
+    start = 1000.0
+    server.tables[unused].empty_since = start - 1
+    server.tables[abandoned].empty_since = start
+    assert server.reap_tables(start + TABLE_IDLE_TIMEOUT / 2) == 0
+    assert server.reap_tables(start + TABLE_IDLE_TIMEOUT) == 2
+    assert set(server.tables) == {watched}
+    assert unused not in server.tables
+
+def test_full_server_reclaims_abandoned_tables(monkeypatch):
+    server = GameServer(max_tables=2)
+    for _ in range(2):
+        server.new_table(2)
+    with pytest.raises(ValueError):
+        server.new_table(2)
+    monkeypatch.setattr("server.TABLE_IDLE_TIMEOUT", 0)
+    assert server.new_table(2)
+    assert len(server.tables) == 1
+
+
+@pytest.fixture
+def server_port():
+    """ Servidor em localhost, com o laço de eventos em uma thread; fornece a porta. """
+    game_server = GameServer()
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(game_server.start(port=0))
+        started.set()
+        loop.run_forever()
+
+    async def shutdown():
+        game_server.close()
+        game_server.server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()  # Conexões ainda abertas
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert started.wait(5)
+    yield game_server.port
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+def wait_until(clients, condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while True:
+        for client in clients:
+            client.poll()
+        if condition():
+            return
+        assert time.monotonic() < deadline, "o servidor não respondeu a tempo"
+        time.sleep(0.005)
+
+def visible_state(state):
+    """ O que os clientes veem da mesa; o baralho de inundação fica só no servidor. """
+    return (state.state_key(), state.turn_count, state.sink_order, state.drowned_players, state.player_positions)
+
+def test_clients_over_localhost_follow_the_table(server_port):
+    seed = 7
+    reference = GameState(4, seed=seed)
+    host = GameClient(port=server_port)
+    guest = GameClient(port=server_port)
+    try:
+        table_id = host.create_table(4, 6, seed)
+        assert table_id in guest.list_tables()
+        host.join(table_id)
+        guest_role = reference.player_turn_order[1]
+        guest.join(table_id, guest_role)
+        assert visible_state(host.state) == visible_state(guest.state) == visible_state(reference)
+
+        guest.send_move("passar")  # Ainda não é a vez do convidado
+        wait_until([guest], lambda: not guest.pending_moves)
+        assert guest.errors == [f"é a vez de {reference.current_role()}"]
+
+        while not reference.is_over() and reference.turn_count < 40:
+            action = greedy_action(reference)
+            sender = guest if reference.current_role() == guest_role else host
+            reference.apply_action(action)
+            sender.send_move(action)
+            wait_until([host, guest], lambda: not sender.pending_moves)
+        wait_until([host, guest], lambda: visible_state(host.state) == visible_state(guest.state)
+                   == visible_state(reference))
+        assert host.errors == [] and len(guest.errors) == 1
+    finally:
+        host.close()
+        guest.close()
+
+
+def test_too_long_line_is_refused_and_closed(server_port):
+    with socket.create_connection(("127.0.0.1", server_port), 5) as connection:
+        connection.sendall(b"LIST " + b"x" * 100000 + b"\n")
+        with connection.makefile("rb") as stream:
+            assert stream.readline() == "E linha longa demais\n".encode("utf-8")
+            assert stream.readline() == b""  # Conexão encerrada pelo servidor
@@ -0,0 +1,51 @@
+"""
+Testes dos snapshots binários do GameState.
+"""
+import copy
+import pickle
+
+import pytest
+
+from conftest import play
+from engine import MAX_SEED, GameState
+
+
+@pytest.mark.parametrize("restore", [
+    lambda state: GameState.from_bytes(state.to_bytes()),
+    lambda state: pickle.loads(pickle.dumps(state)),
+    copy.deepcopy,
+    lambda state: state.copy(),
+])
+def test_restored_state_continues_like_the_original(restore):
+    for seed in range(40):
+        state = GameState(4, seed=seed)
+        play(state, 3)
+        restored = restore(state)
+        assert restored.to_bytes() == state.to_bytes()
+        for _ in range(40):
+            play(state, 1)
+            play(restored, 1)
+            assert restored.to_bytes() == state.to_bytes()
+
+def test_round_trip_on_a_large_grid():
+    state = GameState(2, grid_size=20, seed=9)
+    play(state, 25)
+    restored = GameState.from_bytes(state.to_bytes())
+    assert restored.to_bytes() == state.to_bytes()
+    assert restored.sink_order == state.sink_order
+    assert restored.player_positions == state.player_positions
+
+@pytest.mark.parametrize("seed", [-1, MAX_SEED + 1])
+def test_seeds_that_do_not_fit_are_rejected(seed):
+    with pytest.raises(ValueError):
+        GameState(2, seed=seed)
+
+def test_largest_seed_fits():
+    state = GameState(2, seed=MAX_SEED)
+    assert GameState.from_bytes(state.to_bytes()).seed == MAX_SEED
+
+def test_rejects_other_versions():
+    data = bytearray(GameState(2, seed=1).to_bytes())
+    data[4] += 1
+    with pytest.raises(ValueError):
+        GameState.from_bytes(bytes(data))